@@ -0,0 +1,6 @@
+"""Python interface to Agilent Chemstation for CE instrument control."""
+
+from .chemstation_api import ChemstationAPI
+from .exceptions import ChemstationError, CommandError, VialError
+
+__all__ = ["ChemstationAPI", "ChemstationError", "CommandError", "VialError"]
@@ -0,0 +1,37 @@
+"""Top-level entry point bundling the Chemstation controller modules."""
+
+from typing import Optional
+
+from .core.chemstation_communication import ChemstationCommunicator
+from .controllers.ce_module import CEModule
+from .controllers.validation import ValidationModule
+
+
+class ChemstationAPI:
+    """Facade over the individual Chemstation controller modules.
+
+    Attributes:
+        ce: Carousel and lift control of the CE instrument.
+        validation: Pre-run state validation helpers.
+
+    Args:
+        exchange_dir: Directory shared with the Chemstation macro; the
+            default location is used when omitted.
+    """
+
+    def __init__(self, exchange_dir: Optional[str] = None):
+        self.comm = ChemstationCommunicator(exchange_dir=exchange_dir)
+        self.ce = CEModule(self.comm)
+        self.validation = ValidationModule(self.comm)
+
+    def send_command(self, command: str, timeout: Optional[float] = None) -> str:
+        """Send a raw command-processor statement to Chemstation.
+
+        Args:
+            command: Statement to execute.
+            timeout: Seconds to wait for the response.
+
+        Returns:
+            The response string from Chemstation.
+        """
+        return self.comm.send(command, timeout=timeout)
@@ -0,0 +1,4 @@
+from .ce_module import CEModule
+from .validation import ValidationModule
+
+__all__ = ["CEModule", "ValidationModule"]
@@ -0,0 +1,145 @@
+"""Control of the CE instrument's vial carousel through Chemstation."""
+
+import time
+
+from ..core.chemstation_communication import ChemstationCommunicator
+from ..exceptions import VialError
+
+# Carousel positions understood by the Chemstation macro.
+VALID_POSITIONS = ("inlet", "outlet", "replenishment")
+
+# Worst-case carousel rotation time used as the command timeout (seconds).
+CAROUSEL_TIMEOUT = 30.0
+
+
+class CEModule:
+    """High-level carousel and lift operations of the CE 7100 instrument.
+
+    Args:
+        comm: Communicator connected to the running Chemstation session.
+    """
+
+    def __init__(self, comm: ChemstationCommunicator):
+        self.comm = comm
+
+    def load_vial_to_position(self, vial: int, position: str = "replenishment") -> None:
+        """Move a carousel vial into one of the instrument lift positions.
+
+        Blocks until Chemstation reports that the carousel has finished
+        moving and the vial is raised at the target position.
+
+        Args:
+            vial: Carousel position of the vial (1-50).
+            position: Lift to load the vial into ("inlet", "outlet" or
+                "replenishment").
+
+        Raises:
+            VialError: If the vial cannot be loaded.
+        """
+        token = self.start_load_vial(vial, position)
+        self.finish_load_vial(token, vial, position)
+
+    def start_load_vial(self, vial: int,
+                        position: str = "replenishment") -> int:
+        """Issue a vial load without waiting for the carousel.
+
+        The carousel moves on independent hardware, so callers can
+        overlap the seconds of rotation with syringe work and collect
+        the outcome with :meth:`finish_load_vial`.
+
+        Args:
+            vial: Carousel position of the vial (1-50).
+            position: Lift to load the vial into.
+
+        Returns:
+            Token to pass to :meth:`finish_load_vial`.
+        """
+        if position not in VALID_POSITIONS:
+            raise ValueError(f"Unknown lift position: {position!r}")
+        return self.comm.send_async(f'LoadVial {vial}, "{position}"')
+
+    def finish_load_vial(self, token: int, vial: int,
+                         position: str = "replenishment") -> None:
+        """Wait for a load started with start_load_vial to complete.
+
+        Args:
+            token: Token returned by :meth:`start_load_vial`.
+            vial: Vial number, for the error message only.
+            position: Lift position, for the error message only.
+
+        Raises:
+            VialError: If the vial could not be loaded.
+        """
+        response = self.comm.wait_response(token, timeout=CAROUSEL_TIMEOUT)
+        if response.startswith("ERROR"):
+            raise VialError(f"Failed to load vial {vial} to {position}: {response}")
+
+    def unload_vial_from_position(self, position: str = "replenishment") -> None:
+        """Lower the vial at a lift position and return it to the carousel.
+
+        Args:
+            position: Lift position to unload ("inlet", "outlet" or
+                "replenishment").
+
+        Raises:
+            VialError: If the vial cannot be unloaded.
+        """
+        token = self.start_unload_vial(position)
+        self.finish_unload_vial(token, position)
+
+    def start_unload_vial(self, position: str = "replenishment") -> int:
+        """Issue a vial unload without waiting for the carousel.
+
+        Counterpart of :meth:`start_load_vial` for the return trip:
+        callers can overlap the carousel's lowering and rotation with
+        syringe work and collect the outcome with
+        :meth:`finish_unload_vial`.
+
+        Args:
+            position: Lift position to unload.
+
+        Returns:
+            Token to pass to :meth:`finish_unload_vial`.
+        """
+        if position not in VALID_POSITIONS:
+            raise ValueError(f"Unknown lift position: {position!r}")
+        return self.comm.send_async(f'UnloadVial "{position}"')
+
+    def finish_unload_vial(self, token: int,
+                           position: str = "replenishment") -> None:
+        """Wait for an unload started with start_unload_vial to complete.
+
+        Args:
+            token: Token returned by :meth:`start_unload_vial`.
+            position: Lift position, for the error message only.
+
+        Raises:
+            VialError: If the vial could not be unloaded.
+        """
+        response = self.comm.wait_response(token, timeout=CAROUSEL_TIMEOUT)
+        if response.startswith("ERROR"):
+            raise VialError(f"Failed to unload vial from {position}: {response}")
+
+    def get_vial_state(self, vial: int) -> str:
+        """Query the presence/position state of a carousel vial.
+
+        Args:
+            vial: Carousel position to query (1-50).
+
+        Returns:
+            The state string reported by Chemstation (e.g. "carousel",
+            "inlet", "absent").
+        """
+        return self.comm.send(f"VialState {vial}")
+
+    def wait_if_busy(self, timeout: float = CAROUSEL_TIMEOUT) -> None:
+        """Block until the carousel reports idle.
+
+        Args:
+            timeout: Maximum seconds to wait.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.comm.send("CarouselBusy") != "1":
+                return
+            time.sleep(0.2)
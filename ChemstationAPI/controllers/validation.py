@@ -0,0 +1,81 @@
+"""Pre-run validation helpers for the CE system state."""
+
+from ..core.chemstation_communication import ChemstationCommunicator
+from ..exceptions import VialError
+
+
+class ValidationModule:
+    """Checks of instrument and carousel state before running workflows.
+
+    Args:
+        comm: Communicator connected to the running Chemstation session.
+    """
+
+    def __init__(self, comm: ChemstationCommunicator):
+        self.comm = comm
+
+    def validate_vial_in_system(self, vial: int) -> None:
+        """Verify that a vial is present anywhere in the CE system.
+
+        Args:
+            vial: Carousel position to check (1-50).
+
+        Raises:
+            VialError: If the vial is not present in the system.
+        """
+        if not (1 <= vial <= 50):
+            raise ValueError(f"Vial number {vial} outside valid range (1-50)")
+        state = self.comm.send(f"VialState {vial}")
+        if state in ("", "absent"):
+            raise VialError(
+                f"Vial {vial} is not present in the system - "
+                f"insert it before starting the workflow"
+            )
+
+    def validate_vials_in_system(self, vials) -> None:
+        """Verify that several vials are present in one exchange.
+
+        A single ``VialState`` query naming all vials replaces one
+        Chemstation round trip per vial; the macro answers with the
+        states comma-separated in query order. Falls back to per-vial
+        queries when the macro predates the multi-vial form.
+
+        Args:
+            vials: Carousel positions to check (1-50).
+
+        Raises:
+            VialError: If any of the vials is not present in the system.
+        """
+        vials = tuple(vials)
+        for vial in vials:
+            if not (1 <= vial <= 50):
+                raise ValueError(
+                    f"Vial number {vial} outside valid range (1-50)")
+        response = self.comm.send(
+            "VialState " + ", ".join(map(str, vials)))
+        states = [state.strip() for state in response.split(",")]
+        if len(states) != len(vials):
+            for vial in vials:
+                self.validate_vial_in_system(vial)
+            return
+        for vial, state in zip(vials, states):
+            if state in ("", "absent"):
+                raise VialError(
+                    f"Vial {vial} is not present in the system - "
+                    f"insert it before starting the workflow"
+                )
+
+    def validate_method_exists(self, method_name: str) -> None:
+        """Verify that a named Chemstation method is available.
+
+        Args:
+            method_name: Method name without the .M extension.
+
+        Raises:
+            VialError: Never; raises CommandError via the communicator on
+                protocol failures.
+            FileNotFoundError: If the method is not found.
+        """
+        response = self.comm.send(f'MethodExists "{method_name}"')
+        if response != "1":
+            raise FileNotFoundError(f"Chemstation method not found: {method_name}")
@@ -0,0 +1,3 @@
+from .chemstation_communication import ChemstationCommunicator
+
+__all__ = ["ChemstationCommunicator"]
@@ -0,0 +1,113 @@
+"""File-based command exchange with a running Chemstation macro.
+
+Chemstation runs a small macro that polls a command file in the exchange
+directory, executes each numbered command and writes the result into a
+response file. This module implements the Python side of that protocol:
+commands are appended with an increasing sequence number and the response
+file is polled until the matching number appears.
+"""
+
+import os
+import time
+from typing import Optional
+
+from ..exceptions import CommunicationTimeoutError
+
+# Default exchange directory used by the Chemstation macro.
+DEFAULT_EXCHANGE_DIR = os.path.join(
+    os.path.expanduser("~"), "Documents", "ChemstationExchange"
+)
+
+COMMAND_FILENAME = "command.txt"
+RESPONSE_FILENAME = "response.txt"
+
+# How long to sleep between response-file polls (seconds).
+POLL_INTERVAL = 0.05
+
+
+class ChemstationCommunicator:
+    """Send commands to Chemstation and collect their responses.
+
+    Args:
+        exchange_dir: Directory shared with the Chemstation macro. Created
+            if it does not exist.
+        timeout: Default number of seconds to wait for a response.
+    """
+
+    def __init__(self, exchange_dir: Optional[str] = None, timeout: float = 5.0):
+        self.exchange_dir = exchange_dir or DEFAULT_EXCHANGE_DIR
+        self.timeout = timeout
+        self._command_file = os.path.join(self.exchange_dir, COMMAND_FILENAME)
+        self._response_file = os.path.join(self.exchange_dir, RESPONSE_FILENAME)
+        self._command_number = 0
+        os.makedirs(self.exchange_dir, exist_ok=True)
+
+    def send(self, command: str, timeout: Optional[float] = None) -> str:
+        """Send a single Chemstation command and wait for its response.
+
+        Args:
+            command: Chemstation command processor statement to execute.
+            timeout: Seconds to wait for the response; defaults to the
+                communicator-wide timeout.
+
+        Returns:
+            The response string produced by Chemstation (may be empty for
+            commands without a return value).
+
+        Raises:
+            CommunicationTimeoutError: If no matching response arrives in time.
+        """
+        number = self.send_async(command)
+        return self.wait_response(number, timeout)
+
+    def send_async(self, command: str) -> int:
+        """Write a command without waiting for its response.
+
+        Use for long-running instrument actions (carousel moves) that
+        should overlap with other device traffic; collect the result
+        later with :meth:`wait_response`.
+
+        Args:
+            command: Chemstation command processor statement to execute.
+
+        Returns:
+            The sequence number identifying the pending command.
+        """
+        self._command_number += 1
+        number = self._command_number
+        with open(self._command_file, "w", encoding="utf-8") as handle:
+            handle.write(f"{number} {command}")
+        return number
+
+    def wait_response(self, number: int,
+                      timeout: Optional[float] = None) -> str:
+        """Wait for the response to a command issued with send_async.
+
+        Args:
+            number: Sequence number returned by :meth:`send_async`.
+            timeout: Seconds to wait; defaults to the communicator-wide
+                timeout.
+
+        Returns:
+            The response string produced by Chemstation.
+
+        Raises:
+            CommunicationTimeoutError: If no matching response arrives in time.
+        """
+        return self._read_response(number, timeout or self.timeout)
+
+    def _read_response(self, number: int, timeout: float) -> str:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if os.path.exists(self._response_file):
+                with open(self._response_file, "r", encoding="utf-8") as handle:
+                    content = handle.read()
+                if content:
+                    resp_number, _, payload = content.partition(" ")
+                    if resp_number.isdigit() and int(resp_number) == number:
+                        return payload.strip()
+            time.sleep(POLL_INTERVAL)
+        raise CommunicationTimeoutError(
+            f"No response from Chemstation for command #{number} "
+            f"within {timeout} s"
+        )
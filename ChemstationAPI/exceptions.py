@@ -0,0 +1,17 @@
+"""Exception types raised by the Chemstation interface."""
+
+
+class ChemstationError(Exception):
+    """Base class for all Chemstation communication errors."""
+
+
+class CommandError(ChemstationError):
+    """A command sent to Chemstation failed or returned an error response."""
+
+
+class CommunicationTimeoutError(ChemstationError):
+    """Chemstation did not answer a command within the allowed time."""
+
+
+class VialError(ChemstationError):
+    """A required vial is missing from the carousel or cannot be moved."""
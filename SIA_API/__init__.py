@@ -0,0 +1,12 @@
+"""Sequential Injection Analysis (SIA) device drivers and workflows."""
+
+from .core import SyringeController, ValveSelector
+from .methods import PreparedSIAMethods, PortConfig, SIAConfig
+
+__all__ = [
+    "SyringeController",
+    "ValveSelector",
+    "PreparedSIAMethods",
+    "PortConfig",
+    "SIAConfig",
+]
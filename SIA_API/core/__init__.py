@@ -0,0 +1,23 @@
+from .async_device import AsyncDevice
+from .command_batch import BatchError, CommandBatch
+from .serial_bus import SerialBus, shared_serial
+from .serial_writer import SerialWriterThread
+from .syringe_controller import SyringeController
+from .valve_selector import ValveSelector
+from .simulation import (SimulationClock, SimulatedChemstation,
+                         SimulatedSyringe, SimulatedValve)
+
+__all__ = [
+    "AsyncDevice",
+    "BatchError",
+    "CommandBatch",
+    "SerialBus",
+    "SerialWriterThread",
+    "SyringeController",
+    "ValveSelector",
+    "SimulationClock",
+    "SimulatedChemstation",
+    "SimulatedSyringe",
+    "SimulatedValve",
+    "shared_serial",
+]
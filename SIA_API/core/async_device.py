@@ -0,0 +1,110 @@
+"""Future-based execution of blocking device calls on a worker thread.
+
+Driver methods like ``aspirate`` block for seconds of pump motion while
+the calling thread has other useful work (valve repositioning, status
+output, cycle planning). :class:`AsyncDevice` wraps a driver so each
+call is submitted to a dedicated worker thread and returns a
+:class:`~concurrent.futures.Future` immediately; the caller overlaps
+independent work and joins only before the next command that actually
+depends on the device's state.
+
+The prepared workflows mostly overlap through lighter mechanisms -
+posted Chemstation loads and non-blocking motion tails - but scripts
+coordinating two independent manifolds, or a syringe and valve on
+separate ports, can drive each through its own AsyncDevice. Calls on one
+wrapper stay strictly ordered; the shared-bus lock keeps exchanges from
+different wrappers from interleaving on one line.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+# Sentinel queued to stop the worker thread.
+_SHUTDOWN = object()
+
+
+class AsyncDevice:
+    """Proxy running a device driver's methods on its own thread.
+
+    Attribute access returns a submitting callable, so the wrapper is
+    used exactly like the wrapped driver except that every call returns
+    a future::
+
+        pump = AsyncDevice(syringe)
+        move = pump.dispense(500)
+        valve.position(waste_port)   # overlaps the dispense
+        move.result()
+
+    Args:
+        device: Driver instance whose blocking calls should run on the
+            worker thread.
+    """
+
+    def __init__(self, device):
+        self._device = device
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _SHUTDOWN:
+                return
+            method, args, kwargs, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = method(*args, **kwargs)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def submit(self, method_name: str, *args, **kwargs) -> Future:
+        """Queue one driver method call for the worker thread.
+
+        Args:
+            method_name: Name of the method on the wrapped driver.
+            *args: Positional arguments for the call.
+            **kwargs: Keyword arguments for the call.
+
+        Returns:
+            Future resolving with the call's return value.
+        """
+        future = Future()
+        self._queue.put((getattr(self._device, method_name), args,
+                         kwargs, future))
+        return future
+
+    def __getattr__(self, name):
+        attr = getattr(self._device, name)
+        if not callable(attr):
+            return attr
+
+        def _submit(*args, **kwargs):
+            future = Future()
+            self._queue.put((attr, args, kwargs, future))
+            return future
+
+        return _submit
+
+    def wait_idle(self) -> None:
+        """Block until every call submitted so far has finished.
+
+        Use as a barrier before operations outside the wrapper that
+        depend on the device being settled, e.g. a carousel unload.
+        """
+        self.submit_barrier().result()
+
+    def submit_barrier(self) -> Future:
+        """Queue a no-op resolving after everything queued before it."""
+        future = Future()
+        self._queue.put((lambda: None, (), {}, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker thread after the queue empties."""
+        self._queue.put(_SHUTDOWN)
+        self._thread.join()
@@ -0,0 +1,177 @@
+"""Batched transmission of device commands.
+
+Cleaning and flush routines issue long runs of small commands, each
+paying a full serial write-wait-read round trip. :class:`CommandBatch`
+temporarily reroutes the syringe's frame sender (and optionally the
+selection valve's position command) into per-device buffers; pure setter
+commands (speed changes, head-valve and selector switches) accumulate,
+and any motion command first flushes the buffers so ordering and fluid
+semantics are preserved. A buffer flush writes all pending frames with a
+single serial write and reads the acknowledgements back in bulk.
+"""
+
+import time
+from collections import deque
+
+from .valve_selector import ROTATION_SETTLE
+
+# Syringe opcodes that move the plunger or start a firmware repeat
+# block. A frame containing any of them anywhere in its body forces a
+# flush before it executes; everything else (speed changes, head-valve
+# switches) is a pure setter and may keep accumulating.
+_MOTION_OPCODES = frozenset(b"PDgG")
+
+
+class BatchError(RuntimeError):
+    """A command in a batch flush went unacknowledged.
+
+    Because a flush writes many frames before reading any reply, the
+    index pinpoints which command in the batch failed.
+
+    Attributes:
+        index: Zero-based position of the failing frame in the flush.
+        frame: The wire frame that was not acknowledged.
+    """
+
+    def __init__(self, index: int, frame: bytes):
+        super().__init__(
+            f"Batched command {index} ({frame!r}) was not acknowledged")
+        self.index = index
+        self.frame = frame
+
+
+class CommandBatch:
+    """Context manager buffering syringe and valve commands.
+
+    Args:
+        syringe: Syringe driver whose frames should be buffered.
+        valve: Optional selection valve whose position commands should be
+            buffered alongside.
+    """
+
+    def __init__(self, syringe, valve=None):
+        self.syringe = syringe
+        self.valve = valve
+        # Two-priority scheme: urgent frames (safety-relevant commands
+        # queued mid-batch) always drain before the normal stream.
+        # Abort and status queries on the driver bypass batching
+        # entirely and hit the serial port directly.
+        self._urgent = deque()
+        self._normal = deque()
+        self._valve_buffer = deque()
+        self._orig_send_frame = None
+        self._orig_position = None
+        # True while this context is nested inside an already-active
+        # batch on the same pump; the context is then a no-op.
+        self._nested = False
+
+    # --- buffered replacements ---------------------------------------------
+
+    def _buffered_send_frame(self, frame, wait=True, expected_duration=None):
+        self._normal.append(frame)
+        # Scan the whole frame, not just the leading opcode: chained
+        # frames such as V...P... (speed+stroke) and ID...O (head-valve
+        # dispense) open with a setter byte but still move the plunger,
+        # and letting them sit in the buffer would allow queued valve
+        # rotations to jump ahead of them on the wire.
+        if wait and not _MOTION_OPCODES.isdisjoint(frame):
+            self.flush()
+        return b""
+
+    def push_urgent(self, frame):
+        """Queue a frame ahead of the normal command stream."""
+        self._urgent.append(frame)
+
+    def _buffered_position(self, position, force=False):
+        if not (1 <= position <= self.valve.num_positions):
+            raise ValueError(
+                f"Valve position {position} outside valid range "
+                f"(1-{self.valve.num_positions})"
+            )
+        # Keep the valve's last-position shadow coherent so redundant
+        # moves are elided inside the batch too.
+        if position == self.valve._current_position and not force:
+            return
+        self._valve_buffer.append(self.valve._pos_cmds[position])
+        self.valve._current_position = position
+
+    # --- flushing -----------------------------------------------------------
+
+    def _flush_valve(self):
+        if not self._valve_buffer:
+            return
+        frames = tuple(self._valve_buffer)
+        self._valve_buffer.clear()
+        # The exchange lock is held across the joined write and all ack
+        # reads so another driver sharing the bus cannot interleave a
+        # frame mid-batch and cross the reply streams; the settle sleep
+        # happens after release so the bus is usable meanwhile.
+        with self.valve._serial.lock:
+            self.valve._serial.write(b"".join(frames))
+            for index, frame in enumerate(frames):
+                if not self.valve._serial.read_until(b"\r"):
+                    raise BatchError(index, frame)
+        # Only the final position matters for settling.
+        time.sleep(ROTATION_SETTLE)
+
+    def _flush_syringe(self):
+        frames = tuple(self._urgent) + tuple(self._normal)
+        if not frames:
+            return
+        self._urgent.clear()
+        self._normal.clear()
+        # Lock across the whole write/ack exchange (see _flush_valve);
+        # the ready wait polls with per-frame exchanges of its own.
+        with self.syringe._serial.lock:
+            self.syringe._serial.write(b"".join(frames))
+            for index, frame in enumerate(frames):
+                if not self.syringe._serial.read_until(b"\r"):
+                    raise BatchError(index, frame)
+        self.syringe._wait_for_ready()
+
+    def flush(self):
+        """Write all buffered frames, valve moves first."""
+        self._flush_valve()
+        self._flush_syringe()
+
+    # --- context protocol ---------------------------------------------------
+
+    def __enter__(self):
+        # Simulated devices have no frame sender; batching is then a no-op
+        # and all calls flow through unchanged.
+        if not hasattr(self.syringe, "_send_frame"):
+            return self
+        # A batch is already buffering this pump: entering a second one
+        # would swap out its patched sender, and the inner flush would
+        # write its frames ahead of commands still queued in the outer
+        # buffers. The inner context is therefore a no-op and every
+        # call keeps flowing through the active batch, which preserves
+        # program order on the wire.
+        active = getattr(self.syringe, "_active_batch", None)
+        if active is not None:
+            self._nested = True
+            return active
+        self._orig_send_frame = self.syringe._send_frame
+        self.syringe._send_frame = self._buffered_send_frame
+        self.syringe._active_batch = self
+        if self.valve is not None:
+            self._orig_position = self.valve.position
+            self.valve.position = self._buffered_position
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._nested:
+            self._nested = False
+            return False
+        try:
+            if exc_type is None and self._orig_send_frame is not None:
+                self.flush()
+        finally:
+            if self._orig_send_frame is not None:
+                self.syringe._send_frame = self._orig_send_frame
+                self.syringe._active_batch = None
+                self._orig_send_frame = None
+            if self._orig_position is not None:
+                self.valve.position = self._orig_position
+                self._orig_position = None
+        return False
@@ -0,0 +1,93 @@
+"""Shared serial handles for devices on one physical bus.
+
+SIA manifolds commonly daisy-chain the syringe pump and the selection
+valve on a single RS-485 line behind one USB adapter; the devices are
+then distinguished by their bus address, not by the port. Opening the
+port twice - once per driver - fails outright on Windows and doubles the
+USB enumeration cost elsewhere. :func:`shared_serial` keeps one
+persistent :class:`SerialBus` per port name and hands the same handle to
+every driver that asks for it, so the batching and low-latency tuning
+applied to the handle benefit both devices uniformly.
+"""
+
+import threading
+
+import serial
+
+# One open bus per port name; first open fixes the line parameters.
+_open_buses = {}
+_registry_lock = threading.Lock()
+
+
+class SerialBus:
+    """Thread-safe wrapper around one open serial port.
+
+    Each read and write holds the bus lock, and drivers hold it across a
+    whole write/read exchange (see :attr:`lock`) so replies cannot be
+    interleaved when two device drivers share the line.
+
+    Args:
+        port: Serial port name (e.g. "COM3").
+        baudrate: Serial line speed.
+        timeout: Serial read timeout in seconds.
+    """
+
+    def __init__(self, port: str, baudrate: int = 9600,
+                 timeout: float = 1.0):
+        self._serial = serial.Serial(port=port, baudrate=baudrate,
+                                     timeout=timeout)
+        self.port = port
+        # Reentrant so a driver holding the exchange lock can still call
+        # the locked read/write methods below.
+        self.lock = threading.RLock()
+        # USB-serial adapters buffer received bytes for up to 16 ms by
+        # default; low-latency mode (where the driver supports it, e.g.
+        # FTDI adapters on Linux) shrinks that to ~1 ms. Applied once
+        # here so every command round trip on the bus benefits, from the
+        # first initialization frame on.
+        try:
+            self._serial.set_low_latency_mode(True)
+            self.low_latency = True
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            self.low_latency = False
+
+    def write(self, data: bytes) -> int:
+        with self.lock:
+            return self._serial.write(data)
+
+    def read_until(self, terminator: bytes = b"\r") -> bytes:
+        with self.lock:
+            return self._serial.read_until(terminator)
+
+    def set_low_latency_mode(self, enable: bool) -> None:
+        self._serial.set_low_latency_mode(enable)
+
+    def close(self) -> None:
+        """Close the port and drop it from the shared registry."""
+        with _registry_lock:
+            _open_buses.pop(self.port, None)
+        self._serial.close()
+
+
+def shared_serial(port: str, baudrate: int = 9600,
+                  timeout: float = 1.0) -> SerialBus:
+    """Return the open bus for a port, opening it on first use.
+
+    Subsequent requests for the same port name get the existing handle;
+    their baudrate and timeout arguments are ignored, since the line
+    parameters belong to the bus, not to the individual device.
+
+    Args:
+        port: Serial port name.
+        baudrate: Serial line speed used when the port is first opened.
+        timeout: Serial read timeout used when the port is first opened.
+
+    Returns:
+        The shared bus handle for the port.
+    """
+    with _registry_lock:
+        bus = _open_buses.get(port)
+        if bus is None:
+            bus = SerialBus(port, baudrate=baudrate, timeout=timeout)
+            _open_buses[port] = bus
+        return bus
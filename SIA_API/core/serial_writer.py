@@ -0,0 +1,77 @@
+"""Background serial transmission with completion futures.
+
+:class:`SerialWriterThread` owns a serial handle and drains a queue of
+outgoing frames on a dedicated thread, so callers can keep doing
+Python-side bookkeeping (status formatting, config lookups, cycle
+planning) while bytes trickle out on the UART. Commands that expect an
+acknowledgement resolve their future with the response bytes; pure
+writes resolve with ``None`` as soon as they are on the wire.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+# Sentinel queued to stop the writer thread.
+_SHUTDOWN = object()
+
+
+class SerialWriterThread:
+    """Drain outgoing command frames to a serial port on its own thread.
+
+    Args:
+        serial_port: Open serial handle the thread takes ownership of
+            for writing and response reads.
+    """
+
+    def __init__(self, serial_port):
+        self._serial = serial_port
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _SHUTDOWN:
+                return
+            frame, expect_response, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._serial.write(frame)
+                response = (self._serial.read_until(b"\r")
+                            if expect_response else None)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(response)
+
+    def submit(self, frame: bytes, expect_response: bool = True) -> Future:
+        """Queue a frame for transmission.
+
+        Args:
+            frame: Complete wire frame to write.
+            expect_response: Read one terminator-delimited response and
+                resolve the future with it; otherwise the future
+                resolves with None once the frame is written.
+
+        Returns:
+            Future resolving when the frame (and any response) is done.
+        """
+        future = Future()
+        self._queue.put((frame, expect_response, future))
+        return future
+
+    def drain(self) -> None:
+        """Block until every queued frame has been transmitted.
+
+        Implemented as an empty barrier write: it resolves only after
+        everything queued before it has gone out.
+        """
+        self.submit(b"", expect_response=False).result()
+
+    def close(self) -> None:
+        """Stop the writer thread after the queue empties."""
+        self._queue.put(_SHUTDOWN)
+        self._thread.join()
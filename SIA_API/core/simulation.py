@@ -0,0 +1,217 @@
+"""Offline stand-ins for the SIA devices and Chemstation.
+
+The simulated devices implement the same interface as the real drivers
+but perform no serial I/O: each operation only advances a shared
+simulation clock by the time the hardware would need. Passing them to
+:class:`~SIA_API.methods.prepared_methods.PreparedSIAMethods` turns any
+workflow into an instant dry run that yields the expected wall-clock
+duration, which makes protocol development and timing optimization loops
+run in microseconds instead of minutes of pump motion.
+"""
+
+from typing import Optional
+
+from .valve_selector import ROTATION_SETTLE
+
+# Fixed durations of mechanical actions that do not scale with volume
+# (seconds). Rough measurements on our hardware; good enough for planning.
+SYRINGE_INIT_TIME = 2.0
+HEAD_VALVE_SWITCH_TIME = 0.3
+CAROUSEL_MOVE_TIME = 3.0
+
+
+class SimulationClock:
+    """Accumulated virtual time shared by a set of simulated devices."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def advance(self, seconds: float) -> None:
+        self.elapsed += seconds
+
+
+class SimulatedSyringe:
+    """Drop-in replacement for SyringeController that only tracks time.
+
+    Args:
+        syringe_size: Installed syringe volume in microlitres.
+        clock: Simulation clock to advance; a private one is created
+            when omitted.
+    """
+
+    def __init__(self, syringe_size: int,
+                 clock: Optional[SimulationClock] = None):
+        self.syringe_size = syringe_size
+        self.address = 1
+        self.clock = clock or SimulationClock()
+        self._current_speed = None
+        self._valve_state = None
+        self._plunger_volume = 0.0
+
+    def _motion_time(self, volume: float) -> float:
+        # Without a speed set, assume a nominal 1000 µL/min stroke.
+        speed = self._current_speed or 1000
+        return volume / speed * 60
+
+    def initialize(self) -> None:
+        self.clock.advance(SYRINGE_INIT_TIME)
+        self._current_speed = None
+        self._plunger_volume = 0.0
+
+    def set_speed_uL_min(self, speed: float) -> None:
+        self._current_speed = speed
+
+    def aspirate(self, volume: float, wait: bool = True,
+                 speed: Optional[float] = None) -> None:
+        if volume > self.syringe_size:
+            raise ValueError(
+                f"Volume {volume} µL exceeds syringe size {self.syringe_size} µL"
+            )
+        if speed is not None:
+            self._current_speed = speed
+        self._plunger_volume += volume
+        self.clock.advance(self._motion_time(volume))
+
+    def dispense(self, volume: Optional[float] = None,
+                 wait: bool = True, speed: Optional[float] = None) -> None:
+        if speed is not None:
+            self._current_speed = speed
+        if volume is None:
+            volume = self._plunger_volume
+        self._plunger_volume = max(0.0, self._plunger_volume - volume)
+        self.clock.advance(self._motion_time(volume))
+
+    def wait_for_ready(self) -> None:
+        pass
+
+    def aspirate_dispense_cycles(self, volume: float, cycles: int,
+                                 aspirate_speed: float,
+                                 dispense_speed: float) -> None:
+        self.clock.advance(cycles * volume * 60
+                           * (1 / aspirate_speed + 1 / dispense_speed))
+
+    def program_cycle(self, volume: float, cycles: int,
+                      aspirate_speed: float, dispense_speed: float,
+                      delay_after_aspirate: float = 0.0,
+                      delay_after_dispense: float = 0.0) -> None:
+        self.clock.advance(
+            cycles * (volume * 60 * (1 / aspirate_speed + 1 / dispense_speed)
+                      + delay_after_aspirate + delay_after_dispense))
+
+    def push_through_valve_in(self, volume: Optional[float] = None) -> None:
+        if volume is None:
+            volume = self._plunger_volume
+        self._plunger_volume = max(0.0, self._plunger_volume - volume)
+        self.clock.advance(2 * HEAD_VALVE_SWITCH_TIME
+                           + self._motion_time(volume))
+        self._valve_state = "out"
+
+    def valve_in(self) -> None:
+        if self._valve_state != "in":
+            self.clock.advance(HEAD_VALVE_SWITCH_TIME)
+            self._valve_state = "in"
+
+    def valve_out(self) -> None:
+        if self._valve_state != "out":
+            self.clock.advance(HEAD_VALVE_SWITCH_TIME)
+            self._valve_state = "out"
+
+    def valve_up(self) -> None:
+        if self._valve_state != "up":
+            self.clock.advance(HEAD_VALVE_SWITCH_TIME)
+            self._valve_state = "up"
+
+    # Batched-write interface: frames are (operation, argument) markers
+    # that write_many replays against the clock.
+
+    def frame_speed(self, speed: float):
+        return ("speed", speed)
+
+    def frame_aspirate(self, volume: float):
+        return ("aspirate", volume)
+
+    def frame_dispense(self, volume: float):
+        return ("dispense", volume)
+
+    def write_many(self, commands) -> None:
+        for op, arg in commands:
+            if op == "speed":
+                self.set_speed_uL_min(arg)
+            elif op == "aspirate":
+                self.aspirate(arg)
+            else:
+                self.dispense(arg)
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedValve:
+    """Drop-in replacement for ValveSelector that only tracks time.
+
+    Args:
+        num_positions: Number of selectable ports on the valve head.
+        clock: Simulation clock to advance; a private one is created
+            when omitted.
+    """
+
+    def __init__(self, num_positions: int = 8,
+                 clock: Optional[SimulationClock] = None):
+        self.num_positions = num_positions
+        self.clock = clock or SimulationClock()
+
+    def position(self, position: int) -> None:
+        if not (1 <= position <= self.num_positions):
+            raise ValueError(
+                f"Valve position {position} outside valid range "
+                f"(1-{self.num_positions})"
+            )
+        self.clock.advance(ROTATION_SETTLE)
+
+    def close(self) -> None:
+        pass
+
+
+class _SimulatedCE:
+    def __init__(self, clock: SimulationClock):
+        self.clock = clock
+
+    def load_vial_to_position(self, vial, position="replenishment"):
+        self.clock.advance(CAROUSEL_MOVE_TIME)
+
+    def start_load_vial(self, vial, position="replenishment"):
+        return 0
+
+    def finish_load_vial(self, token, vial, position="replenishment"):
+        self.clock.advance(CAROUSEL_MOVE_TIME)
+
+    def unload_vial_from_position(self, position="replenishment"):
+        self.clock.advance(CAROUSEL_MOVE_TIME)
+
+    def start_unload_vial(self, position="replenishment"):
+        return 0
+
+    def finish_unload_vial(self, token, position="replenishment"):
+        self.clock.advance(CAROUSEL_MOVE_TIME)
+
+
+class _SimulatedValidation:
+    def validate_vial_in_system(self, vial):
+        pass
+
+    def validate_vials_in_system(self, vials):
+        pass
+
+
+class SimulatedChemstation:
+    """Drop-in replacement for ChemstationAPI for offline dry runs.
+
+    Args:
+        clock: Simulation clock to advance; a private one is created
+            when omitted.
+    """
+
+    def __init__(self, clock: Optional[SimulationClock] = None):
+        self.clock = clock or SimulationClock()
+        self.ce = _SimulatedCE(self.clock)
+        self.validation = _SimulatedValidation()
@@ -0,0 +1,560 @@
+"""Driver for Cavro/Hamilton-style syringe pumps on a serial line.
+
+The pump speaks the common OEM ASCII protocol: commands are framed as
+``/<address><command>R\\r`` and answered with a status byte followed by
+optional data. Plunger positions are expressed in motor steps over a
+3000-step full stroke, so microlitre volumes are converted through the
+configured syringe size.
+"""
+
+import struct
+import time
+from functools import lru_cache
+from typing import Optional
+
+from .command_batch import CommandBatch
+from .serial_bus import shared_serial
+
+# Full plunger stroke of the pump drive in motor steps.
+FULL_STROKE_STEPS = 3000
+
+# Status byte reported by the pump while the plunger or valve is moving.
+STATUS_BUSY = b"@"
+
+# Interval between busy polls while waiting for a move to finish (seconds).
+POLL_INTERVAL = 0.1
+
+# Shorter poll interval used for the tail of a predicted wait, where the
+# move is known to be almost complete.
+TAIL_POLL_INTERVAL = 0.02
+
+
+@lru_cache(maxsize=4096)
+def _command_frame(address: int, command: str) -> bytes:
+    """Return the encoded wire frame for a command body.
+
+    Cached because fills and mixing loops re-send a small set of identical
+    commands (the cycle volumes from a split are mostly equal), so repeated
+    frames reuse the same bytes object instead of re-running the f-string
+    and encode.
+    """
+    return f"/{address}{command}R\r".encode("ascii")
+
+
+@lru_cache(maxsize=4096)
+def _motion_frame(address: int, opcode: str, steps: int) -> bytes:
+    """Return the encoded wire frame for a single-parameter motion command."""
+    return f"/{address}{opcode}{steps}R\r".encode("ascii")
+
+
+@lru_cache(maxsize=2048)
+def _volume_steps(volume: float, syringe_size: int) -> int:
+    """Convert a volume in µL to motor steps for a given syringe size.
+
+    Cached because fill and mixing loops convert the same one or two
+    volumes over and over; together with the frame cache this makes a
+    repeated aspirate a pair of dict lookups.
+    """
+    return round(volume * FULL_STROKE_STEPS / syringe_size)
+
+
+@lru_cache(maxsize=4096)
+def _binary_motion_frame(address: int, opcode: str, steps: int) -> bytes:
+    """Return the fixed-size binary frame for a motion command.
+
+    Newer pump firmware accepts 4-byte binary frames instead of ASCII
+    decimals; at modest baud rates the shorter message saves several
+    milliseconds per command.
+    """
+    return struct.pack("<BBH", address, ord(opcode), steps)
+
+
+class SyringeController:
+    """Control of a single syringe pump over RS-232/USB serial.
+
+    Args:
+        port: Serial port name (e.g. "COM3").
+        syringe_size: Installed syringe volume in microlitres.
+        address: Pump address on the serial bus (factory default 1).
+        baudrate: Serial line speed.
+        timeout: Serial read timeout in seconds.
+        binary_protocol: Encode motion commands as fixed-size binary
+            frames instead of ASCII decimals. Requires firmware with
+            binary protocol support; ASCII remains the safe default.
+        supports_overlap: Declare that the manifold tolerates the
+            selection valve rotating during the trailing plunger stroke
+            (a holding coil isolates the syringe from the selector).
+            Workflows then overlap valve moves with pump motion; keep
+            False when the syringe draws straight from the selector.
+    """
+
+    def __init__(self, port: str, syringe_size: int, address: int = 1,
+                 baudrate: int = 9600, timeout: float = 1.0,
+                 binary_protocol: bool = False,
+                 supports_overlap: bool = False):
+        self.syringe_size = syringe_size
+        self.address = address
+        self.binary_protocol = binary_protocol
+        self.supports_overlap = supports_overlap
+        # Handle comes from the shared-bus registry: a valve daisy-
+        # chained on the same port reuses this handle instead of opening
+        # the port a second time.
+        self._serial = shared_serial(port, baudrate=baudrate,
+                                     timeout=timeout)
+        # Last speed sent to the pump, used to skip redundant speed
+        # commands (each one is a full serial round trip).
+        self._current_speed = None
+        # Last commanded head-valve path ("in"/"out"/"up"), used to skip
+        # redundant switch commands; None while unknown.
+        self._valve_state = None
+        # Commanded syringe content in µL, maintained in software so
+        # "dispense everything" needs no plunger-position query (a
+        # blocking read round trip). Reset by initialize().
+        self._plunger_volume = 0.0
+
+    # --- low-level protocol -------------------------------------------------
+
+    def _build_command(self, command: str) -> bytes:
+        return _command_frame(self.address, command)
+
+    def _send(self, command: str, wait: bool = True,
+              expected_duration: Optional[float] = None) -> bytes:
+        """Write one command frame and read the immediate acknowledgement.
+
+        Args:
+            command: Command body without address frame and terminator.
+            wait: Block until the pump reports idle before returning.
+            expected_duration: Predicted motion time in seconds, used to
+                delay the first busy poll.
+
+        Returns:
+            The raw acknowledgement bytes from the pump.
+        """
+        return self._send_frame(self._build_command(command), wait=wait,
+                                expected_duration=expected_duration)
+
+    def _motion(self, opcode: str, steps: int, wait: bool = True,
+                expected_duration: Optional[float] = None) -> bytes:
+        """Send a single-parameter motion command in the active encoding."""
+        if self.binary_protocol:
+            frame = _binary_motion_frame(self.address, opcode, steps)
+        else:
+            frame = _motion_frame(self.address, opcode, steps)
+        return self._send_frame(frame, wait=wait,
+                                expected_duration=expected_duration)
+
+    def _send_frame(self, frame: bytes, wait: bool = True,
+                    expected_duration: Optional[float] = None) -> bytes:
+        """Write a prebuilt wire frame and read the acknowledgement."""
+        # The exchange lock keeps write and reply paired when another
+        # device driver shares the bus from a different thread.
+        with self._serial.lock:
+            self._serial.write(frame)
+            response = self._serial.read_until(b"\r")
+        if wait:
+            self._wait_for_ready(expected_duration)
+        return response
+
+    def _query(self, command: str) -> bytes:
+        """Send a query command and return its data bytes without waiting."""
+        with self._serial.lock:
+            self._serial.write(f"/{self.address}{command}\r".encode("ascii"))
+            return self._serial.read_until(b"\r")
+
+    def _wait_for_ready(self,
+                        expected_duration: Optional[float] = None) -> None:
+        """Poll the pump status until the current move has finished.
+
+        The pump has no completion interrupt, so readiness is confirmed
+        by polling the busy byte. When the caller knows how long the
+        move should take, most of that time is slept up front and the
+        poll loop only confirms completion, which replaces dozens of
+        status round trips with typically a single one.
+
+        Args:
+            expected_duration: Predicted motion time in seconds; polls
+                start immediately when omitted.
+        """
+        interval = POLL_INTERVAL
+        if expected_duration is not None and expected_duration > POLL_INTERVAL:
+            # Sleep out 95% of the prediction, then confirm with short
+            # polls; the margin absorbs prediction error and ramp times.
+            time.sleep(0.95 * expected_duration)
+            interval = TAIL_POLL_INTERVAL
+        while True:
+            status = self._query("Q")
+            if STATUS_BUSY not in status:
+                return
+            time.sleep(interval)
+
+    def _volume_to_steps(self, volume: float) -> int:
+        return _volume_steps(volume, self.syringe_size)
+
+    def _steps_to_volume(self, steps: int) -> float:
+        return steps * self.syringe_size / FULL_STROKE_STEPS
+
+    def _expected_motion_time(self, volume: float) -> Optional[float]:
+        """Predict a plunger move's duration from the active speed.
+
+        Returns None when no speed has been set since initialization, in
+        which case the busy-wait falls back to plain polling.
+        """
+        if self._current_speed:
+            return volume / self._current_speed * 60
+        return None
+
+    # --- public API ---------------------------------------------------------
+
+    def initialize(self) -> None:
+        """Home the plunger and valve; must be called once after power-up."""
+        self._send("Z")
+        self._current_speed = None
+        self._valve_state = None
+        self._plunger_volume = 0.0
+
+    def _speed_to_pulses(self, speed: float) -> int:
+        """Convert a flow rate in µL/min to plunger pulses per second."""
+        return round(speed * FULL_STROKE_STEPS / self.syringe_size / 60)
+
+    def set_speed_uL_min(self, speed: float) -> None:
+        """Set the plunger speed.
+
+        Redundant calls with the speed already active are skipped, so
+        callers may set the speed defensively without paying a serial
+        round trip each time.
+
+        Args:
+            speed: Flow rate in microlitres per minute.
+        """
+        if speed == self._current_speed:
+            return
+        self._motion("V", self._speed_to_pulses(speed))
+        self._current_speed = speed
+
+    def aspirate(self, volume: float, wait: bool = True,
+                 speed: Optional[float] = None) -> None:
+        """Draw liquid into the syringe.
+
+        Args:
+            volume: Volume to aspirate in microlitres.
+            wait: Block until the move completes. Pass False to return
+                after the command is acknowledged and overlap the motion
+                with other work; call :meth:`wait_for_ready` before the
+                next dependent command.
+            speed: Flow rate in microlitres per minute; when given and
+                different from the active speed, the speed change is
+                chained into the motion frame, saving the separate
+                round trip of a set_speed_uL_min call.
+
+        Raises:
+            ValueError: If the volume exceeds the installed syringe size.
+        """
+        if volume > self.syringe_size:
+            raise ValueError(
+                f"Volume {volume} µL exceeds syringe size {self.syringe_size} µL"
+            )
+        self._speed_motion("P", self._volume_to_steps(volume), volume,
+                           speed, wait)
+        self._plunger_volume += volume
+
+    def dispense(self, volume: Optional[float] = None,
+                 wait: bool = True, speed: Optional[float] = None) -> None:
+        """Push liquid out of the syringe.
+
+        Args:
+            volume: Volume to dispense in microlitres; when omitted, the
+                full current syringe content (as tracked in software) is
+                dispensed without querying the pump.
+            wait: Block until the move completes. Pass False to return
+                after the command is acknowledged.
+            speed: Flow rate in microlitres per minute; when given and
+                different from the active speed, the speed change is
+                chained into the motion frame.
+        """
+        if volume is None:
+            volume = self._plunger_volume
+        self._speed_motion("D", self._volume_to_steps(volume), volume,
+                           speed, wait)
+        self._plunger_volume = max(0.0, self._plunger_volume - volume)
+
+    def _speed_motion(self, opcode: str, steps: int, volume: float,
+                      speed: Optional[float], wait: bool) -> None:
+        """Issue a motion command, chaining a speed change when needed."""
+        if speed is not None and speed != self._current_speed:
+            self._current_speed = speed
+            self._send(f"V{self._speed_to_pulses(speed)}{opcode}{steps}",
+                       wait=wait,
+                       expected_duration=self._expected_motion_time(volume))
+        else:
+            self._motion(opcode, steps, wait=wait,
+                         expected_duration=self._expected_motion_time(volume))
+
+    def wait_for_ready(self) -> None:
+        """Block until a move started with ``wait=False`` has finished."""
+        self._wait_for_ready()
+
+    def frame_speed(self, speed: float) -> bytes:
+        """Return the wire frame for a speed change, for use with write_many.
+
+        Updates the cached current speed, so the returned frame must
+        actually be sent.
+
+        Args:
+            speed: Flow rate in microlitres per minute.
+        """
+        self._current_speed = speed
+        return _motion_frame(self.address, "V", self._speed_to_pulses(speed))
+
+    def frame_aspirate(self, volume: float) -> bytes:
+        """Return the wire frame for an aspiration, for use with write_many.
+
+        Updates the tracked syringe content, so the returned frame must
+        actually be sent.
+
+        Args:
+            volume: Volume to aspirate in microlitres.
+        """
+        self._plunger_volume += volume
+        return _motion_frame(self.address, "P", self._volume_to_steps(volume))
+
+    def frame_dispense(self, volume: float) -> bytes:
+        """Return the wire frame for a dispense, for use with write_many.
+
+        Updates the tracked syringe content, so the returned frame must
+        actually be sent.
+
+        Args:
+            volume: Volume to dispense in microlitres.
+        """
+        self._plunger_volume = max(0.0, self._plunger_volume - volume)
+        return _motion_frame(self.address, "D", self._volume_to_steps(volume))
+
+    def write_many(self, commands) -> None:
+        """Send several command frames in a single serial write.
+
+        Coalescing frames that need no intervening response into one
+        write replaces one syscall per command with one per batch. The
+        acknowledgements are read back afterwards and the pump is waited
+        to idle once at the end.
+
+        Args:
+            commands: Iterable of wire frames built with the ``frame_*``
+                helpers.
+        """
+        commands = list(commands)
+        # The exchange lock spans the joined write and all ack reads so
+        # a second driver on a shared bus cannot interleave mid-batch.
+        with self._serial.lock:
+            self._serial.write(b"".join(commands))
+            for _ in commands:
+                self._serial.read_until(b"\r")
+        self._wait_for_ready()
+
+    def batch(self, valve=None) -> CommandBatch:
+        """Return a context manager that batches commands to this pump.
+
+        Inside the ``with`` block, setter commands (speed and head-valve
+        switches) accumulate in a buffer and go out in one serial write;
+        motion commands flush the buffer first so sequencing and fluid
+        semantics are preserved. Pass the selection valve to buffer its
+        position commands in the same batch.
+
+        Args:
+            valve: Optional selection valve whose moves should be
+                buffered alongside the pump commands.
+
+        Returns:
+            The command batch context manager.
+        """
+        return CommandBatch(self, valve)
+
+    def aspirate_dispense_cycles(self, volume: float, cycles: int,
+                                 aspirate_speed: float,
+                                 dispense_speed: float) -> None:
+        """Run repeated aspirate/dispense cycles inside the pump firmware.
+
+        The pump's ``g``/``G<n>`` repeat-block syntax executes the whole
+        loop on the firmware side, so N cycles cost one serial round trip
+        instead of 2N. Use this for mixing loops that need no host-side
+        waits between the strokes.
+
+        Args:
+            volume: Volume moved per cycle in microlitres.
+            cycles: Number of aspirate/dispense repetitions.
+            aspirate_speed: Draw speed in microlitres per minute.
+            dispense_speed: Return speed in microlitres per minute.
+
+        Raises:
+            ValueError: If the volume exceeds the installed syringe size.
+        """
+        if volume > self.syringe_size:
+            raise ValueError(
+                f"Volume {volume} µL exceeds syringe size {self.syringe_size} µL"
+            )
+        steps = self._volume_to_steps(volume)
+        asp_pulses = self._speed_to_pulses(aspirate_speed)
+        disp_pulses = self._speed_to_pulses(dispense_speed)
+        self._send(
+            f"gV{asp_pulses}P{steps}V{disp_pulses}D{steps}G{cycles}"
+        )
+        # The program's embedded V commands leave the pump at the
+        # dispense speed; sync the shadow so set_speed_uL_min's dedup
+        # and motion-time predictions stay truthful.
+        self._current_speed = dispense_speed
+
+    def push_through_valve_in(self, volume: Optional[float] = None) -> None:
+        """Dispense through the input path and return to the output path.
+
+        Chains head-valve-in, dispense and head-valve-out into one
+        command frame, so the common "park an air bubble" idiom costs a
+        single serial round trip instead of three.
+
+        Args:
+            volume: Volume to dispense in microlitres; when omitted, the
+                full current syringe content (as tracked in software) is
+                dispensed without querying the pump.
+        """
+        if volume is None:
+            volume = self._plunger_volume
+        steps = self._volume_to_steps(volume)
+        self._send(f"ID{steps}O",
+                   expected_duration=self._expected_motion_time(volume))
+        self._valve_state = "out"
+        self._plunger_volume = max(0.0, self._plunger_volume - volume)
+
+    def program_cycle(self, volume: float, cycles: int,
+                      aspirate_speed: float, dispense_speed: float,
+                      delay_after_aspirate: float = 0.0,
+                      delay_after_dispense: float = 0.0) -> None:
+        """Run mixing cycles with settle delays inside the pump firmware.
+
+        Extends :meth:`aspirate_dispense_cycles` with the firmware delay
+        opcode (``M``, milliseconds), so even cycles that need settle
+        waits between the strokes run as one serial round trip; the host
+        stays idle for the whole mixing duration.
+
+        Args:
+            volume: Volume moved per cycle in microlitres.
+            cycles: Number of aspirate/dispense repetitions.
+            aspirate_speed: Draw speed in microlitres per minute.
+            dispense_speed: Return speed in microlitres per minute.
+            delay_after_aspirate: Settle wait after each draw (seconds).
+            delay_after_dispense: Settle wait after each return (seconds).
+
+        Raises:
+            ValueError: If the volume exceeds the installed syringe size.
+        """
+        if volume > self.syringe_size:
+            raise ValueError(
+                f"Volume {volume} µL exceeds syringe size {self.syringe_size} µL"
+            )
+        steps = self._volume_to_steps(volume)
+        asp_pulses = self._speed_to_pulses(aspirate_speed)
+        disp_pulses = self._speed_to_pulses(dispense_speed)
+        asp_delay = round(delay_after_aspirate * 1000)
+        disp_delay = round(delay_after_dispense * 1000)
+        body = f"gV{asp_pulses}P{steps}"
+        if asp_delay:
+            body += f"M{asp_delay}"
+        body += f"V{disp_pulses}D{steps}"
+        if disp_delay:
+            body += f"M{disp_delay}"
+        expected = cycles * (volume * 60 * (1 / aspirate_speed
+                                            + 1 / dispense_speed)
+                             + delay_after_aspirate + delay_after_dispense)
+        self._send(f"{body}G{cycles}", expected_duration=expected)
+        # The program's embedded V commands leave the pump at the
+        # dispense speed; sync the shadow so set_speed_uL_min's dedup
+        # and motion-time predictions stay truthful.
+        self._current_speed = dispense_speed
+
+    def run_program(self, steps, wait: bool = True) -> None:
+        """Run a chained sequence of motions and delays in pump firmware.
+
+        The steps are encoded into a single command frame, so the whole
+        sequence costs one serial round trip and inter-step delays
+        execute in the pump instead of as host-side sleeps.
+
+        Args:
+            steps: Iterable of ``(op, value)`` pairs where op is
+                ``"aspirate"`` or ``"dispense"`` with a volume in
+                microlitres, or ``"delay"`` with a duration in seconds.
+            wait: Block until the program completes. Pass False to
+                return after the acknowledgement and overlap the program
+                with other work; call :meth:`wait_for_ready` before the
+                next dependent command.
+
+        Raises:
+            ValueError: If an op is unknown or a volume exceeds the
+                installed syringe size.
+        """
+        body = []
+        expected = 0.0
+        tracked = self._plunger_volume
+        for op, value in steps:
+            if op == "delay":
+                body.append(f"M{round(value * 1000)}")
+                expected += value
+                continue
+            if value > self.syringe_size:
+                raise ValueError(
+                    f"Volume {value} µL exceeds syringe size "
+                    f"{self.syringe_size} µL"
+                )
+            if op == "aspirate":
+                body.append(f"P{self._volume_to_steps(value)}")
+                tracked += value
+            elif op == "dispense":
+                body.append(f"D{self._volume_to_steps(value)}")
+                tracked = max(0.0, tracked - value)
+            else:
+                raise ValueError(f"Unknown program step {op!r}")
+            motion = self._expected_motion_time(value)
+            if motion is not None:
+                expected += motion
+        self._plunger_volume = tracked
+        self._send("".join(body), wait=wait, expected_duration=expected)
+
+    def abort(self) -> None:
+        """Terminate the current plunger move immediately.
+
+        Writes straight to the serial port so the stop cannot be
+        deferred behind an active command batch.
+        """
+        self._serial.write(f"/{self.address}T\r".encode("ascii"))
+        self._serial.read_until(b"\r")
+
+    def query_status(self) -> bytes:
+        """Return the raw pump status byte, bypassing any command batch."""
+        return self._query("Q")
+
+    def valve_in(self) -> None:
+        """Switch the syringe head valve to the input (reservoir) path.
+
+        Skipped when the head valve already points there.
+        """
+        if self._valve_state != "in":
+            self._send("I")
+            self._valve_state = "in"
+
+    def valve_out(self) -> None:
+        """Switch the syringe head valve to the output (manifold) path.
+
+        Skipped when the head valve already points there.
+        """
+        if self._valve_state != "out":
+            self._send("O")
+            self._valve_state = "out"
+
+    def valve_up(self) -> None:
+        """Switch the syringe head valve to the bypass/up path.
+
+        Skipped when the head valve already points there.
+        """
+        if self._valve_state != "up":
+            self._send("E")
+            self._valve_state = "up"
+
+    def close(self) -> None:
+        """Close the underlying serial connection."""
+        self._serial.close()
@@ -0,0 +1,77 @@
+"""Driver for a multi-position selection valve on a serial line."""
+
+import time
+
+from .serial_bus import shared_serial
+
+# Worst-case rotation time between any two ports (seconds). The valve does
+# not report motion status, so a fixed settle wait is used after each move.
+ROTATION_SETTLE = 0.5
+
+
+class ValveSelector:
+    """Control of a multi-position distribution valve.
+
+    Args:
+        port: Serial port name (e.g. "COM4").
+        num_positions: Number of selectable ports on the valve head.
+        address: Valve address character on the serial bus.
+        baudrate: Serial line speed.
+        timeout: Serial read timeout in seconds.
+    """
+
+    def __init__(self, port: str, num_positions: int = 8, address: str = "Z",
+                 baudrate: int = 9600, timeout: float = 1.0):
+        self.num_positions = num_positions
+        self.address = address
+        # Handle comes from the shared-bus registry: if the syringe pump
+        # sits on the same port (daisy-chained RS-485), both drivers
+        # share one open handle instead of fighting over the device.
+        self._serial = shared_serial(port, baudrate=baudrate,
+                                     timeout=timeout)
+        # Last commanded port, used to skip redundant moves. The valve
+        # position is unknown until the first move, hence None.
+        self._current_position = None
+        # All possible position frames pre-encoded (the valve has only a
+        # handful of ports), so a move is a list index instead of an
+        # f-string plus encode per call. Index 0 is unused padding.
+        self._pos_cmds = [None] + [
+            f"/{address}GO{p}\r".encode("ascii")
+            for p in range(1, num_positions + 1)
+        ]
+
+    def position(self, position: int, force: bool = False) -> None:
+        """Rotate the valve to a port position.
+
+        Moves to the port already selected are skipped, so callers may
+        position the valve defensively without paying the rotation settle
+        wait each time.
+
+        Args:
+            position: Target port (1 to num_positions).
+            force: Re-issue the move even when the valve already reports
+                this position; use to reseat the rotor after a suspected
+                stall or manual rotation.
+
+        Raises:
+            ValueError: If the position is outside the valve's range.
+        """
+        if not (1 <= position <= self.num_positions):
+            raise ValueError(
+                f"Valve position {position} outside valid range "
+                f"(1-{self.num_positions})"
+            )
+        if position == self._current_position and not force:
+            return
+        with self._serial.lock:
+            self._serial.write(self._pos_cmds[position])
+            ack = self._serial.read_until(b"\r")
+        time.sleep(ROTATION_SETTLE)
+        # An empty read means the acknowledgement timed out and the
+        # rotation may not have happened; drop the shadow so the next
+        # call re-issues the move instead of skipping it as redundant.
+        self._current_position = position if ack else None
+
+    def close(self) -> None:
+        """Close the underlying serial connection."""
+        self._serial.close()
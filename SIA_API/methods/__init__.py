@@ -0,0 +1,4 @@
+from .config import PortConfig, SIAConfig
+from .prepared_methods import PreparedSIAMethods
+
+__all__ = ["PortConfig", "SIAConfig", "PreparedSIAMethods"]
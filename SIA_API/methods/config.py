@@ -0,0 +1,72 @@
+"""Configuration objects for the prepared SIA workflows."""
+
+import sys
+from dataclasses import dataclass
+
+# Slotted dataclasses (3.10+) give C-level attribute access on the hot
+# per-port reads; older interpreters fall back to dict-backed instances.
+if sys.version_info >= (3, 10):
+    from functools import partial
+    _slots_dataclass = partial(dataclass, slots=True)
+else:
+    _slots_dataclass = dataclass
+
+
+@_slots_dataclass
+class PortConfig:
+    """Assignment of manifold lines to selection-valve ports.
+
+    The defaults match the standard plumbing of our SIA manifold; pass a
+    customised instance to ``PreparedSIAMethods`` for other layouts.
+    """
+
+    air_port: int = 1
+    meoh_port: int = 2
+    di_port: int = 3
+    transfer_port: int = 4
+    waste_port: int = 5
+
+
+@dataclass
+class SIAConfig:
+    """Operating parameters for the prepared SIA workflows.
+
+    Port numbers are duplicated here from :class:`PortConfig` so the
+    homogenization and cleaning methods can take everything they need from
+    one object; ``PreparedSIAMethods`` keeps the two in sync when it is
+    constructed with a custom port layout.
+    """
+
+    # Valve ports (kept in sync with PortConfig).
+    air_port: int = 1
+    transfer_port: int = 4
+    waste_port: int = 5
+
+    # Flow rates in microlitres per minute.
+    speed_air: int = 5000
+    speed_normal: int = 1500
+    speed_cleaning: int = 3500
+    mixing_aspirate_speed: int = 2500
+    mixing_dispense_speed: int = 2500
+
+    # Carousel vials used by the workflows.
+    wash_vial: int = 48
+    cleaning_solution_vial: int = 49
+    waste_vial: int = 50
+
+    # Default volumes in microlitres.
+    default_homogenization_volume: int = 400
+    default_transfer_line_volume: int = 600
+    default_air_flush: int = 100
+    cleaning_solution_volume: int = 350
+    air_push_volume: int = 50
+
+    # Wait applied after drawing cleaning solution into the line (seconds).
+    wait_cleaning_reaction: float = 30.0
+
+    # Print progress messages from the workflow methods.
+    verbose: bool = True
+
+    # Replace the hardware devices with simulated stand-ins at
+    # construction; workflows then dry-run against a virtual clock.
+    simulate: bool = False
@@ -0,0 +1,182 @@
+"""Bulk planning of multi-vial fill campaigns.
+
+Instead of letting each ``batch_fill`` call rebuild its own cycle plan,
+a whole plate can be planned in one pass: the cycle decomposition for
+every vial is computed up front and each vial's pump commands are encoded
+into a single chained command frame. During execution one frame is sent
+per vial with a single write, so host-side Python and syscall overhead is
+amortized over the campaign and the wall time is dominated by actual pump
+motion.
+
+The chained programs drive the syringe through its own head valve
+(input path for aspiration, output path for dispensing), so the solvent
+must be plumbed to the syringe input line.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# Action codes of a compiled campaign; see compile_campaign.
+ACTION_SPEED = 0
+ACTION_VALVE = 1
+ACTION_ASPIRATE = 2
+ACTION_DISPENSE = 3
+ACTION_LOAD = 4
+ACTION_UNLOAD = 5
+
+
+@dataclass(frozen=True)
+class CampaignPlan:
+    """Pre-resolved schedule for filling many vials identically.
+
+    All per-vial arithmetic of a continuous-fill campaign - the cycle
+    split, the last-cycle flush hold-back, the resolved ports - is done
+    once at planning time; executing a vial is then a tight loop over
+    precomputed numbers.
+
+    Attributes:
+        vials: Carousel positions of the destination vials, in order.
+        solvent_port: Valve port of the solvent reservoir.
+        transfer_port: Valve port of the transfer line.
+        speed: Fill speed in microlitres per minute.
+        cycle_volumes: Per-cycle aspiration volumes in microlitres.
+        dispense_amounts: Per-cycle dispense volumes; differs from
+            ``cycle_volumes`` only in the last cycle when a needle
+            flush is held back.
+        flush_needle: Volume held back for the needle flush, or None.
+    """
+
+    vials: Tuple[int, ...]
+    solvent_port: int
+    transfer_port: int
+    speed: int
+    cycle_volumes: Tuple[int, ...]
+    dispense_amounts: Tuple[int, ...]
+    flush_needle: Optional[int]
+
+
+@dataclass(frozen=True)
+class CompiledCampaign:
+    """Structure-of-arrays form of a fill campaign.
+
+    The whole campaign is flattened into two parallel arrays: an action
+    code and its integer argument per step. Compared to per-vial Python
+    orchestration this keeps the execution loop to a single dispatch
+    over compact arrays, and allows the entire schedule to be validated
+    before the first motion starts.
+
+    Attributes:
+        actions: Action code per step (``ACTION_*`` constants).
+        args: Integer argument per step (port, volume, vial or speed).
+    """
+
+    actions: array
+    args: array
+
+
+def compile_campaign(plan: CampaignPlan,
+                     syringe_size: int) -> CompiledCampaign:
+    """Flatten a campaign plan into parallel action/argument arrays.
+
+    Every step of every vial is emitted up front, so argument errors
+    (cycle volumes exceeding the syringe, out-of-range vials) surface
+    here instead of mid-campaign with liquid already in the line.
+
+    Args:
+        plan: Campaign plan from ``PreparedSIAMethods.plan_campaign``.
+        syringe_size: Installed syringe volume in microlitres, used to
+            validate the cycle volumes.
+
+    Returns:
+        The compiled campaign.
+
+    Raises:
+        ValueError: If a cycle volume is not positive or exceeds the
+            syringe, or a vial number is out of carousel range.
+    """
+    for volume in plan.cycle_volumes:
+        if not 0 < volume <= syringe_size:
+            raise ValueError(
+                f"Cycle volume {volume} µL outside syringe range "
+                f"(1-{syringe_size} µL)"
+            )
+    for vial in plan.vials:
+        if not 1 <= vial <= 50:
+            raise ValueError(
+                f"Vial number {vial} outside valid range (1-50)")
+    actions = array("B", [ACTION_SPEED])
+    args = array("l", [plan.speed])
+    for vial in plan.vials:
+        actions.append(ACTION_LOAD)
+        args.append(vial)
+        for asp, disp in zip(plan.cycle_volumes, plan.dispense_amounts):
+            actions.extend((ACTION_VALVE, ACTION_ASPIRATE,
+                            ACTION_VALVE, ACTION_DISPENSE))
+            args.extend((plan.solvent_port, asp,
+                         plan.transfer_port, disp))
+        actions.append(ACTION_UNLOAD)
+        args.append(0)
+    return CompiledCampaign(actions=actions, args=args)
+
+
+@dataclass
+class VialFillPlan:
+    """Precomputed fill plan for a single vial.
+
+    Attributes:
+        vial: Carousel position of the destination vial.
+        cycle_volumes: Per-cycle volumes in microlitres.
+        program: Complete chained pump command frame for the fill.
+    """
+
+    vial: int
+    cycle_volumes: Tuple[int, ...]
+    program: bytes
+
+
+def plan_plate_fill(vials: Sequence[int], volumes: Sequence[int],
+                    syringe) -> List[VialFillPlan]:
+    """Compute fill plans for a whole plate in one pass.
+
+    Args:
+        vials: Carousel positions of the destination vials.
+        volumes: Volume to deliver to each vial in microlitres.
+        syringe: Syringe driver used to size and encode the programs.
+
+    Returns:
+        One :class:`VialFillPlan` per vial, in campaign order.
+
+    Raises:
+        ValueError: If the input sequences differ in length or a volume
+            is not positive.
+    """
+    if len(vials) != len(volumes):
+        raise ValueError(
+            f"vials ({len(vials)}) and volumes ({len(volumes)}) must have "
+            f"the same length"
+        )
+    max_volume = syringe.syringe_size
+    plans = []
+    # Plates are usually filled with one or two distinct volumes, so the
+    # split and the encoded program are memoized per volume; repeated
+    # vials reuse the same bytes object instead of re-encoding.
+    encoded = {}
+    for vial, volume in zip(vials, volumes):
+        if volume <= 0:
+            raise ValueError(f"Volume must be positive, got {volume}")
+        cached = encoded.get(volume)
+        if cached is None:
+            full_cycles, remainder = divmod(volume, max_volume)
+            cycle_volumes = (max_volume,) * full_cycles
+            if remainder:
+                cycle_volumes = cycle_volumes + (remainder,)
+            body = "".join(
+                f"IP{steps}OD{steps}"
+                for steps in map(syringe._volume_to_steps, cycle_volumes)
+            )
+            program = f"/{syringe.address}{body}R\r".encode("ascii")
+            cached = (cycle_volumes, program)
+            encoded[volume] = cached
+        plans.append(VialFillPlan(vial, cached[0], cached[1]))
+    return plans
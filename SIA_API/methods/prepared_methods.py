@@ -0,0 +1,1971 @@
+"""Prepared SIA workflows combining the syringe pump, selection valve and CE.
+
+This module contains the ready-made sample-preparation procedures used in
+our CE experiments: transfer-line priming, continuous and batch vial
+filling, in-vial homogenization and the associated cleaning routines. All
+methods assume the standard manifold plumbing described in
+:class:`~SIA_API.methods.config.PortConfig`.
+"""
+
+import asyncio
+import itertools
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import warnings
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Callable, Dict, List, Mapping, NamedTuple,
+                    Optional, Sequence, Tuple)
+
+from ..core.command_batch import CommandBatch
+from .config import PortConfig, SIAConfig
+
+if TYPE_CHECKING:
+    from ..core.syringe_controller import SyringeController
+    from ..core.valve_selector import ValveSelector
+
+
+def _noop_status(message: str, end: str = "\n") -> None:
+    """Status sink used in place of ``_print_status`` when not verbose."""
+
+
+def _noop_wait() -> None:
+    """Join callable for overlapped operations that are already done."""
+
+
+# Sentinel for "lift state unknown": distinct from None (known empty) so
+# defensive unloads still reach the hardware after manual intervention.
+_UNKNOWN_VIAL = object()
+
+# Horizontal rule used in section banners, built once at import.
+_HR = "=" * 80
+
+
+class _StatusStreamHandler(logging.Handler):
+    """Render queued status records as carriage-return console lines."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            end = getattr(record, "end", "\n")
+            print(f"\r{record.getMessage():<80}", end=end, flush=True)
+        except Exception:
+            self.handleError(record)
+
+
+# Status messages are enqueued on the hot path and rendered by a
+# background listener thread, so cycle loops never block on stdio (which
+# can take milliseconds on serial consoles or Jupyter streams).
+_status_queue = queue.SimpleQueue()
+_status_logger = logging.getLogger("SIA_API.status")
+_status_logger.addHandler(logging.handlers.QueueHandler(_status_queue))
+_status_logger.setLevel(logging.INFO)
+_status_logger.propagate = False
+_status_listener = logging.handlers.QueueListener(_status_queue,
+                                                  _StatusStreamHandler())
+_status_listener.start()
+
+
+class _StatusLine:
+    """Single console progress line with change and rate gating.
+
+    Per-cycle progress updates sit between hardware commands, and every
+    flushed stdout write is a syscall the next command then waits on.
+    Rendering only when the text changed, at most ~30 times a second,
+    keeps the console responsive while dropping the per-cycle write
+    cost from the loops. Padding to the full line width happens once at
+    render time, so callers need no trailing-space literals.
+    """
+
+    __slots__ = ("_last_text", "_next_render")
+
+    # Minimum interval between renders; ~30 Hz is beyond what the eye
+    # tracks on a progress line.
+    _MIN_INTERVAL = 1 / 30
+
+    def __init__(self):
+        self._last_text = None
+        self._next_render = 0.0
+
+    def set(self, text: str) -> None:
+        """Render the line if it changed and the rate gate allows."""
+        now = time.monotonic()
+        if text == self._last_text or now < self._next_render:
+            return
+        self._last_text = text
+        self._next_render = now + self._MIN_INTERVAL
+        print(f"\r{text:<80}", end="", flush=True)
+
+
+class SolventStep(NamedTuple):
+    """One solvent plug of a multi-solvent fill.
+
+    A tuple-backed record (no per-instance dict), so pre-built step
+    lists stay compact and unpack directly in the fill loop.
+
+    Attributes:
+        port: Valve port of the solvent reservoir.
+        volume: Plug volume in microlitres.
+        speed: Fill speed in microlitres per minute.
+    """
+
+    port: int
+    volume: int
+    speed: int
+
+
+class _CycleSchedule:
+    """Per-cycle volumes of a split transfer, computed on demand.
+
+    Reads like a sequence of ``full_cycles`` copies of ``max_volume``
+    followed by the remainder (when nonzero) without ever materializing
+    it, so a schedule costs three stored ints no matter how many cycles
+    it describes.
+    """
+
+    __slots__ = ("full_cycles", "remainder", "max_volume")
+
+    def __init__(self, full_cycles: int, remainder: int, max_volume: int):
+        self.full_cycles = full_cycles
+        self.remainder = remainder
+        self.max_volume = max_volume
+
+    def __len__(self) -> int:
+        return self.full_cycles + (1 if self.remainder else 0)
+
+    def __iter__(self):
+        full = itertools.repeat(self.max_volume, self.full_cycles)
+        if self.remainder:
+            return itertools.chain(full, (self.remainder,))
+        return full
+
+    def __getitem__(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("cycle index out of range")
+        return self.max_volume if index < self.full_cycles else self.remainder
+
+
+def _precise_sleep(seconds: float) -> None:
+    """Sleep with sub-millisecond accuracy for short mixing waits.
+
+    ``time.sleep`` alone overshoots short waits by the scheduler tick
+    (~1 ms on Linux, up to ~15 ms on Windows), which adds visible jitter
+    to mixing cycle times. For waits above 10 ms most of the interval is
+    still spent in ``time.sleep``; the final ~5 ms are burned in a
+    ``perf_counter`` spin to hit the deadline precisely.
+
+    Args:
+        seconds: Wait duration in seconds; values <= 0 return immediately.
+    """
+    if seconds <= 0:
+        return
+    end = time.perf_counter() + seconds
+    if seconds > 0.01:
+        time.sleep(seconds - 0.005)
+    while time.perf_counter() < end:
+        pass
+
+
+class PreparedSIAMethods:
+    """Ready-made SIA sample-preparation workflows.
+
+    Args:
+        chemstation: Connected :class:`~ChemstationAPI.ChemstationAPI`
+            instance used for carousel control and validation.
+        syringe_device: Initialised syringe pump driver.
+        valve_device: Initialised selection valve driver.
+        ports: Manifold port layout; defaults to the standard plumbing.
+        config: Workflow operating parameters; defaults are suitable for
+            the standard manifold.
+    """
+
+    # Status-message templates shared by the cleaning methods. Bound
+    # ``str.format`` callables and constant strings are built once at
+    # class creation instead of re-running an f-string per call.
+    _MSG_CYCLE_ASP = "Cycle {}/{}: Aspirating {} µL from port {}...".format
+    _MSG_CYCLE_BUBBLE = "Cycle {}/{}: Bubbling {} µL of air...".format
+    _MSG_SOLVENT = "Solvent {}/{}: {} µL from port {}...".format
+    _MSG_AIR_INJECT = "Cycle {}/{}: Injecting {} µL of air...".format
+    _MSG_MIX_ASP = "Cycle {}/{}: Aspirating {} µL at {} µL/min...".format
+    _MSG_MIX_DISP = "Cycle {}/{}: Dispensing {} µL at {} µL/min...".format
+    _MSG_CLEAN_WITH = "Cleaning with {} µL solution...".format
+    _MSG_NEEDLE_FLUSH = "Flushing needle with {} µL...".format
+    _MSG_CLEAN_BUBBLE = "Aspirating air bubble after cleaning..."
+    _MSG_CLEAN_DONE = "Transfer line cleaned."
+    _MSG_NEEDLE_DONE = "Needle flush complete."
+    _MSG_FLUSH_WASTE = "Flushing transfer line to waste..."
+    _MSG_FLUSH_DONE = "Transfer line flushed."
+
+    def __init__(self, chemstation, syringe_device: "SyringeController",
+                 valve_device: "ValveSelector",
+                 ports: Optional[PortConfig] = None,
+                 config: Optional[SIAConfig] = None):
+        if config is not None and config.simulate:
+            # Protocol-validation mode: stand in simulated devices so
+            # every workflow dry-runs against a virtual clock. Real
+            # devices may be passed (their geometry is copied) or left
+            # as None when no hardware is attached at all.
+            from ..core.simulation import (SimulationClock,
+                                           SimulatedChemstation,
+                                           SimulatedSyringe, SimulatedValve)
+            clock = SimulationClock()
+            chemstation = SimulatedChemstation(clock)
+            syringe_device = SimulatedSyringe(
+                getattr(syringe_device, "syringe_size", 1000), clock)
+            valve_device = SimulatedValve(
+                getattr(valve_device, "num_positions", 8), clock)
+            self.sim_clock = clock
+        self.chemstation = chemstation
+        self.syringe = syringe_device
+        self.valve = valve_device
+        # The shared serial bus enables adapter low-latency mode when it
+        # opens the port; re-apply here for externally supplied handles
+        # and warn when the adapter keeps its default receive buffering
+        # (typically 16 ms of dead time per command round trip).
+        for device in (syringe_device, valve_device):
+            serial_handle = getattr(device, "_serial", None)
+            if serial_handle is None or getattr(serial_handle,
+                                                "low_latency", False):
+                continue
+            try:
+                serial_handle.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, OSError,
+                    ValueError):
+                port = getattr(serial_handle, "port", "?")
+                warnings.warn(
+                    f"Serial port {port} is not in low-latency mode; "
+                    f"expect ~16 ms of extra latency per device command",
+                    RuntimeWarning, stacklevel=2)
+        self.syringe_size = syringe_device.syringe_size
+        self.ports = ports or PortConfig()
+        # Shared resolved-ports mapping for calls without overrides (the
+        # overwhelmingly common case) plus a memo for repeated override
+        # combinations; campaigns no longer rebuild the dict per vial.
+        self._default_ports_dict = {
+            "air_port": self.ports.air_port,
+            "meoh_port": self.ports.meoh_port,
+            "di_port": self.ports.di_port,
+            "transfer_port": self.ports.transfer_port,
+            "waste_port": self.ports.waste_port,
+        }
+        self._ports_cache = {}
+        # Pre-encoded syringe-rinse sequences keyed by (volume, speed);
+        # see _flush_syringe_loop.
+        self._flush_frame_cache = {}
+        # Hot-path copies of the frequently used ports as plain int
+        # attributes: loops read these with one attribute load instead
+        # of hashing a dict key per dereference.
+        self._air_port = self.ports.air_port
+        self._transfer_port = self.ports.transfer_port
+        self._waste_port = self.ports.waste_port
+        if config is None:
+            config = SIAConfig(
+                air_port=self.ports.air_port,
+                transfer_port=self.ports.transfer_port,
+                waste_port=self.ports.waste_port,
+            )
+        self.config = config
+        # Valid update_config keys, precomputed so per-kwarg validation
+        # is a set lookup instead of a hasattr round trip.
+        self._config_keys = frozenset(config.__dict__)
+        # Resolved keyword-argument defaults; see _refresh_defaults.
+        self._refresh_defaults()
+        # Carousel positions accepted by the workflows; kept on the
+        # instance so the limit lives in one place.
+        self._VIAL_RANGE = range(1, 51)
+        # Bound status sink matching the configured verbosity; methods
+        # with a per-call override rebind locally via _status_printer.
+        self._print_status = self._status_printer(self.config.verbose)
+        # Gated renderer for per-cycle progress lines; see _StatusLine.
+        self._progress = _StatusLine()
+        # get_system_status cache; rebuilt lazily after update_config.
+        self._status_cache = None
+        self._status_dirty = True
+        # Vial currently at the replenishment position: None when known
+        # empty, _UNKNOWN_VIAL before the first carousel command. Lets
+        # defensive unload calls skip the carousel motion entirely.
+        self._loaded_vial = _UNKNOWN_VIAL
+        # Earliest monotonic time the next device command may be issued;
+        # see _schedule_delay/_await_deadline.
+        self._earliest_next = 0.0
+
+        # Vials whose presence Chemstation has confirmed this session;
+        # repeat validations short-circuit on this set instead of paying
+        # another round trip.
+        self._validated_vials = set()
+
+        # The wash/waste vial check is deferred to the first carousel
+        # use (see _ensure_validated) so constructing the workflow
+        # object performs no Chemstation I/O.
+        self._session_validated = False
+
+    @classmethod
+    def simulated(cls, syringe_size: int = 1000, num_positions: int = 8,
+                  ports: Optional[PortConfig] = None,
+                  config: Optional[SIAConfig] = None) -> "PreparedSIAMethods":
+        """Build a workflow instance backed by simulated devices.
+
+        Every hardware call on the returned instance only advances a
+        virtual clock, so whole workflows dry-run in microseconds. The
+        predicted wall-clock duration is available as
+        ``instance.sim_clock.elapsed`` (seconds).
+
+        Args:
+            syringe_size: Simulated syringe volume in microlitres.
+            num_positions: Simulated valve port count.
+            ports: Manifold port layout.
+            config: Workflow operating parameters.
+
+        Returns:
+            A PreparedSIAMethods wired to simulated devices.
+        """
+        from ..core.simulation import (SimulationClock, SimulatedChemstation,
+                                       SimulatedSyringe, SimulatedValve)
+        clock = SimulationClock()
+        instance = cls(SimulatedChemstation(clock),
+                       SimulatedSyringe(syringe_size, clock),
+                       SimulatedValve(num_positions, clock),
+                       ports=ports, config=config)
+        instance.sim_clock = clock
+        return instance
+
+    # --- helpers ------------------------------------------------------------
+
+    def _validate_vial(self, vial: int) -> None:
+        """Check that a vial number lies in the carousel range.
+
+        Args:
+            vial: Carousel position to validate.
+
+        Raises:
+            ValueError: If the vial number is outside the carousel range.
+        """
+        if vial not in self._VIAL_RANGE:
+            raise ValueError(
+                f"Vial number {vial} outside valid range "
+                f"({self._VIAL_RANGE[0]}-{self._VIAL_RANGE[-1]})"
+            )
+
+    def _ensure_validated(self) -> None:
+        """Check the wash and waste vials once, on first carousel use.
+
+        Every cleaning and fill workflow depends on these two vials;
+        checking lazily keeps construction free of Chemstation I/O
+        while still failing before any liquid moves.
+
+        Raises:
+            VialError: If the wash or waste vial is missing.
+        """
+        if self._session_validated:
+            return
+        self.chemstation.validation.validate_vials_in_system(
+            (self.config.wash_vial, self.config.waste_vial))
+        self._validated_vials.update(
+            (self.config.wash_vial, self.config.waste_vial))
+        self._session_validated = True
+
+    def _validate_vial_present(self, vial: int) -> None:
+        """Check with Chemstation that a vial is present, caching successes.
+
+        Loads and unloads through these wrappers keep vials in the
+        system, so a vial that validated once stays trusted for the
+        session; call :meth:`invalidate_vial` after removing vials by
+        hand.
+
+        Args:
+            vial: Carousel position to check (1-50).
+
+        Raises:
+            VialError: If the vial is not present in the system.
+        """
+        if vial in self._validated_vials:
+            return
+        self.chemstation.validation.validate_vial_in_system(vial)
+        self._validated_vials.add(vial)
+
+    def invalidate_vial(self, vial: Optional[int] = None) -> None:
+        """Drop cached presence knowledge for one vial, or for all.
+
+        Args:
+            vial: Carousel position to forget; all cached validations
+                are dropped when omitted.
+        """
+        if vial is None:
+            self._validated_vials.clear()
+        else:
+            self._validated_vials.discard(vial)
+
+    def _get_verbose(self, verbose: Optional[bool]) -> bool:
+        """Resolve a per-call verbose override against the configuration.
+
+        The override is collapsed to a real bool so the many ``if
+        verbose:`` tests downstream branch on a constant truth value.
+        """
+        return self.config.verbose if verbose is None else bool(verbose)
+
+    def _print_status_real(self, message: str, end: str = "\n") -> None:
+        """Queue a status line for the background console renderer."""
+        _status_logger.info(message, extra={"end": end})
+
+    def _status_printer(self, verbose: bool):
+        """Return the status callable matching a resolved verbose flag.
+
+        Methods bind the result once and call it unguarded, so the
+        non-verbose path is a plain no-op call instead of a branch plus
+        attribute lookup per status line.
+        """
+        return self._print_status_real if verbose else _noop_status
+
+    def _resolve_ports(self, **overrides) -> Dict[str, int]:
+        """Merge per-call port overrides with the configured layout.
+
+        Calls without overrides share one prebuilt mapping; override
+        combinations are memoized, so repeated calls from a fill
+        campaign cost a dict lookup instead of a rebuild. Callers must
+        treat the result as read-only.
+
+        Args:
+            **overrides: Optional ``<name>_port`` keyword overrides.
+
+        Returns:
+            Mapping of port names to valve positions.
+        """
+        if not overrides:
+            return self._default_ports_dict
+        key = frozenset(overrides.items())
+        ports = self._ports_cache.get(key)
+        if ports is None:
+            ports = dict(self._default_ports_dict)
+            for name, value in overrides.items():
+                if value and name in ports:
+                    ports[name] = value
+            self._ports_cache[key] = ports
+        return ports
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _split_volume_to_cycles(total_volume: int,
+                                max_volume: int) -> Sequence[int]:
+        """Split a transfer volume into syringe-sized cycle volumes.
+
+        A pure function of its two arguments, so the result is memoized:
+        campaigns filling many vials with the same volume hit the cache
+        instead of repeating the split. Both return forms are immutable
+        and safely shared between callers.
+
+        Args:
+            total_volume: Total volume to move in microlitres.
+            max_volume: Largest volume a single cycle may use.
+
+        Returns:
+            Read-only sequence of per-cycle volumes summing to
+            ``total_volume``. Multi-cycle splits are represented by a
+            lazy schedule over the divmod result, so the sequence costs
+            three ints regardless of how many cycles it describes.
+        """
+        if total_volume <= max_volume:
+            return (total_volume,)
+        full_cycles, remainder = divmod(total_volume, max_volume)
+        return _CycleSchedule(full_cycles, remainder, max_volume)
+
+    def _schedule_delay(self, seconds: float) -> None:
+        """Record a settle window instead of sleeping through it.
+
+        The next command issued after :meth:`_await_deadline` will not
+        start before the window elapses, but anything in between (valve
+        rotations, carousel moves, status output) runs inside the
+        window instead of after it.
+
+        Args:
+            seconds: Length of the settle window.
+        """
+        deadline = time.monotonic() + seconds
+        if deadline > self._earliest_next:
+            self._earliest_next = deadline
+
+    def _await_deadline(self) -> None:
+        """Sleep out whatever remains of the last scheduled settle window."""
+        remaining = self._earliest_next - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _batch(self) -> CommandBatch:
+        """Return a context manager that batches device commands.
+
+        Inside the ``with`` block, setter commands (speeds, valve moves)
+        accumulate in per-device buffers and go out in single serial
+        writes; motion commands flush first so sequencing is preserved.
+        """
+        return CommandBatch(self.syringe, self.valve)
+
+    def _flush_syringe_loop(self, volume: int = 150) -> None:
+        """Rinse the syringe barrel and head valve paths with carrier.
+
+        The rinse is a fixed straight-line sequence, so for the real
+        driver its wire frames are pre-encoded once per volume/speed
+        pair and sent in a single serial write with the acknowledgements
+        read back in bulk. Falls back to the batched per-call path for
+        simulated devices or when the syringe is not empty (the
+        dispense-all steps are baked in assuming an empty barrel).
+        """
+        syringe = self.syringe
+        if (not hasattr(syringe, "_build_command")
+                or syringe._plunger_volume):
+            with self._batch():
+                syringe.set_speed_uL_min(self.config.speed_cleaning)
+                self.valve.position(self.ports.waste_port)
+                syringe.valve_in()
+                syringe.aspirate(volume)
+                syringe.valve_up()
+                syringe.aspirate(50)
+                syringe.valve_out()
+                syringe.dispense()
+                syringe.valve_in()
+                syringe.aspirate(50)
+                syringe.valve_out()
+                syringe.dispense()
+            return
+        speed = self.config.speed_cleaning
+        cached = self._flush_frame_cache.get((volume, speed))
+        if cached is None:
+            steps = syringe._volume_to_steps
+            commands = (f"V{syringe._speed_to_pulses(speed)}",
+                        "I", f"P{steps(volume)}",
+                        "E", f"P{steps(50)}",
+                        "O", f"D{steps(volume + 50)}",
+                        "I", f"P{steps(50)}",
+                        "O", f"D{steps(50)}")
+            cached = (b"".join(map(syringe._build_command, commands)),
+                      len(commands))
+            self._flush_frame_cache[(volume, speed)] = cached
+        self.valve.position(self.ports.waste_port)
+        blob, count = cached
+        # Hold the exchange lock across the blob write and its ack
+        # reads so a second driver on a shared bus cannot interleave.
+        with syringe._serial.lock:
+            syringe._serial.write(blob)
+            for _ in range(count):
+                syringe._serial.read_until(b"\r")
+        syringe._wait_for_ready()
+        # Bring the driver's shadows in line with the baked sequence.
+        syringe._current_speed = speed
+        syringe._valve_state = "out"
+        syringe._plunger_volume = 0.0
+
+    def _create_separating_bubble(self, volume: int = 10) -> None:
+        """Draw a small air bubble to separate carrier from solvent.
+
+        The air speed rides chained inside the aspirate frame and the
+        trailing speed restore and head-valve switch coalesce into one
+        write at batch exit, so the five-op sequence costs two syringe
+        writes plus the rotation instead of five round trips.
+        """
+        with self._batch():
+            self.valve.position(self.ports.air_port)
+            self.syringe.aspirate(volume, speed=self.config.speed_air)
+            self.syringe.set_speed_uL_min(self.config.speed_normal)
+            self.syringe.valve_out()
+
+    # --- carousel wrappers --------------------------------------------------
+
+    def load_to_replenishment(self, vial: int,
+                              verbose: Optional[bool] = None) -> None:
+        """Load a carousel vial into the replenishment (needle) position.
+
+        Args:
+            vial: Carousel position of the vial (1-50).
+            verbose: Accepted for interface symmetry; loads produce no
+                output of their own.
+        """
+        self._ensure_validated()
+        if vial == self._loaded_vial:
+            return
+        self.chemstation.ce.load_vial_to_position(vial, "replenishment")
+        self._loaded_vial = vial
+        # A completed load proves the vial exists; later presence
+        # validations on it need no Chemstation query.
+        self._validated_vials.add(vial)
+
+    def unload_from_replenishment(self,
+                                  verbose: Optional[bool] = None) -> None:
+        """Return the vial at the replenishment position to the carousel.
+
+        A no-op when no vial is tracked as loaded, so callers may unload
+        defensively without paying the carousel motion.
+
+        Args:
+            verbose: Accepted for interface symmetry; unloads produce no
+                output of their own.
+        """
+        if self._loaded_vial is None:
+            return
+        self.chemstation.ce.unload_vial_from_position("replenishment")
+        self._loaded_vial = None
+
+    def load_to_replenishment_async(self, vial: int,
+                                    verbose: Optional[bool] = None
+                                    ) -> Callable[[], None]:
+        """Start loading a vial and return a wait callable.
+
+        The carousel runs on independent hardware, so callers can issue
+        the load, keep the syringe busy (speed setup, air bubble,
+        solvent draw) and invoke the returned callable right before the
+        first command that needs the vial at the needle.
+
+        Args:
+            vial: Carousel position of the vial (1-50).
+            verbose: Accepted for interface symmetry; loads produce no
+                output of their own.
+
+        Returns:
+            Zero-argument callable blocking until the vial is seated.
+        """
+        self._ensure_validated()
+        if vial == self._loaded_vial:
+            return lambda: None
+        token = self.chemstation.ce.start_load_vial(vial, "replenishment")
+        # In-flight: the lift state is unknown until the wait resolves.
+        self._loaded_vial = _UNKNOWN_VIAL
+
+        def _wait() -> None:
+            self.chemstation.ce.finish_load_vial(token, vial,
+                                                 "replenishment")
+            self._loaded_vial = vial
+            # A completed load proves the vial exists; later presence
+            # validations on it need no Chemstation query.
+            self._validated_vials.add(vial)
+
+        return _wait
+
+    def unload_from_replenishment_async(self,
+                                        verbose: Optional[bool] = None
+                                        ) -> Callable[[], None]:
+        """Start returning the loaded vial and return a wait callable.
+
+        Counterpart of :meth:`load_to_replenishment_async`: the carousel
+        lowers and rotates on its own hardware, so syringe work issued
+        after this call runs in parallel with the vial's return trip.
+
+        Args:
+            verbose: Accepted for interface symmetry; unloads produce no
+                output of their own.
+
+        Returns:
+            Zero-argument callable blocking until the carousel is done.
+        """
+        if self._loaded_vial is None:
+            return lambda: None
+        token = self.chemstation.ce.start_unload_vial("replenishment")
+        # In-flight: the lift state is unknown until the wait resolves.
+        self._loaded_vial = _UNKNOWN_VIAL
+
+        def _wait() -> None:
+            self.chemstation.ce.finish_unload_vial(token, "replenishment")
+            self._loaded_vial = None
+
+        return _wait
+
+    def _invalidate_vial_state(self) -> None:
+        """Forget the tracked lift state after manual carousel changes.
+
+        Call this when a vial was loaded or removed outside these
+        wrappers; the next load/unload then talks to the hardware
+        unconditionally and presence validations are re-queried.
+        """
+        self._loaded_vial = _UNKNOWN_VIAL
+        self._validated_vials.clear()
+        self._session_validated = False
+
+    def visit_replenishment(self, vials: Sequence[int],
+                            on_each: Callable[[int], None],
+                            verbose: Optional[bool] = None) -> None:
+        """Visit several vials at the replenishment position in one pass.
+
+        Loading the next vial directly replaces the current one in the
+        lift, so intermediate unload/home cycles are skipped; only the
+        final vial is explicitly unloaded. For an n-vial itinerary this
+        saves n-1 full carousel return trips.
+
+        Args:
+            vials: Carousel positions to visit, in order.
+            on_each: Callback invoked with the vial number while that
+                vial sits at the replenishment position.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        for vial in vials:
+            self.load_to_replenishment(vial, verbose=verbose)
+            on_each(vial)
+        self.unload_from_replenishment(verbose=verbose)
+
+    # --- system preparation -------------------------------------------------
+
+    def system_initialization_and_cleaning(self, waste_vial: Optional[int] = None,
+                                           verbose: Optional[bool] = None,
+                                           **port_overrides) -> None:
+        """Initialise the pump and flush all manifold lines before a session.
+
+        Performs syringe homing, a methanol flush, a DI-water flush, a
+        syringe-loop rinse and a transfer-line flush, dispensing everything
+        to the waste vial.
+
+        Args:
+            waste_vial: Carousel vial collecting the flush waste.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        ports = self._resolve_ports(**port_overrides)
+        if waste_vial is None:
+            waste_vial = self._defaults["waste_vial"]
+
+        _status("Initializing system and cleaning lines...")
+        # The waste vial's carousel trip and the pump homing run on
+        # separate hardware with no dependency: the load is posted and
+        # joined only before the transfer-line flush, the first phase
+        # that actually dispenses at the needle (the earlier flushes
+        # leave through the manifold waste line).
+        load_done = self.load_to_replenishment_async(waste_vial,
+                                                     verbose=verbose)
+        self.syringe.initialize()
+        self.syringe.set_speed_uL_min(self.config.speed_normal)
+
+        # The phases are pipelined: each trailing dispense is issued
+        # without blocking, the settle window is scheduled immediately,
+        # and the next phase's status output and bookkeeping run during
+        # the stroke. The selection valve stays put until the pump
+        # reports idle - rotating mid-dispense would misroute liquid -
+        # so wait_for_ready fences each phase boundary.
+        syringe = self.syringe
+        valve = self.valve
+        if getattr(syringe, "supports_overlap", False):
+            # Valve and plunger have independent actuators and the
+            # manifold declares rotation safe mid-stroke, so the switch
+            # to the next port rides out the aspiration's tail; the
+            # fence lands before the next pump command.
+            def _aspirate_then(volume, next_port):
+                syringe.aspirate(volume, wait=False)
+                valve.position(next_port)
+                syringe.wait_for_ready()
+        else:
+            def _aspirate_then(volume, next_port):
+                syringe.aspirate(volume)
+                valve.position(next_port)
+
+        # Methanol flush of the holding coil.
+        _status("Flushing with methanol...", end="")
+        valve.position(ports["air_port"])
+        _aspirate_then(20, ports["meoh_port"])
+        _aspirate_then(250, ports["waste_port"])
+        syringe.dispense(wait=False)
+        self._schedule_delay(1.0)
+
+        # DI-water flush of the holding coil.
+        _status("Flushing with DI water...", end="")
+        syringe.wait_for_ready()
+        valve.position(ports["air_port"])
+        self._await_deadline()
+        _aspirate_then(20, ports["di_port"])
+        _aspirate_then(250, ports["waste_port"])
+        syringe.dispense(wait=False)
+        self._schedule_delay(1.0)
+
+        # Rinse the syringe barrel and head valve.
+        _status("Rinsing syringe loop...", end="")
+        self.syringe.wait_for_ready()
+        self._await_deadline()
+        self._flush_syringe_loop()
+        self._schedule_delay(1.0)
+
+        # Push the transfer line content to the waste vial.
+        _status("Flushing transfer line...", end="")
+        load_done()
+        valve.position(ports["di_port"])
+        self._await_deadline()
+        _aspirate_then(self.config.default_transfer_line_volume,
+                       ports["transfer_port"])
+        syringe.dispense()
+        self._schedule_delay(1.0)
+
+        # The carousel return trip runs inside the final settle window.
+        self.unload_from_replenishment(verbose=verbose)
+        self._await_deadline()
+        _status("System initialization complete.")
+
+    def prepare_continuous_flow(self, solvent_port: int,
+                                verbose: Optional[bool] = None,
+                                **port_overrides) -> None:
+        """Prime the manifold for continuous-flow filling from one solvent.
+
+        Args:
+            solvent_port: Valve port of the solvent reservoir.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        ports = self._resolve_ports(**port_overrides)
+
+        _status(
+            f"Preparing continuous flow from port {solvent_port}...")
+        with self._batch():
+            self.syringe.set_speed_uL_min(self.config.speed_normal)
+            self.valve.position(solvent_port)
+            self.syringe.aspirate(self.syringe_size)
+            self.valve.position(ports["transfer_port"])
+            self.syringe.dispense()
+        # The line-stabilization window overlaps the valve's return to
+        # the solvent port; only the remainder is actually slept.
+        self._schedule_delay(1.0)
+        self.valve.position(solvent_port)
+        self._await_deadline()
+        _status("Continuous flow ready.")
+
+    def prepare_batch_flow(self, solvent_port: int,
+                           verbose: Optional[bool] = None,
+                           **port_overrides) -> None:
+        """Prime the manifold for batch filling with an air-separated plug.
+
+        Args:
+            solvent_port: Valve port of the solvent reservoir.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        ports = self._resolve_ports(**port_overrides)
+
+        if verbose:
+            # One write and one flush for the whole banner; three flushed
+            # prints cost three stdio round trips on slow consoles.
+            sys.stdout.write(
+                f"\r{_HR}\n"
+                f"\rPREPARING BATCH FLOW (Solvent Port: {solvent_port})\n"
+                f"\r{_HR}\n")
+            sys.stdout.flush()
+        with self._batch():
+            self.syringe.set_speed_uL_min(self.config.speed_normal)
+            self._create_separating_bubble()
+            self.valve.position(solvent_port)
+            self.syringe.aspirate(self.syringe_size // 2)
+            self.valve.position(ports["transfer_port"])
+            self.syringe.dispense()
+        # Line-stabilization window; deferred so a follow-up fill's
+        # carousel load can start inside it.
+        self._schedule_delay(1.0)
+        self._await_deadline()
+        _status("Batch flow ready.")
+
+    # --- filling workflows --------------------------------------------------
+
+    def continuous_fill(self, vial: int, volume: int, solvent_port: int,
+                        flush_needle: Optional[int] = None,
+                        speed: Optional[int] = None,
+                        verbose: Optional[bool] = None,
+                        **port_overrides) -> None:
+        """Fill a vial from a continuously primed solvent line.
+
+        Args:
+            vial: Carousel position of the destination vial (1-50).
+            volume: Volume to deliver in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            flush_needle: Volume held back for a needle flush afterwards.
+            speed: Fill speed in microlitres per minute.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        # Only the transfer port is used here; read it straight from the
+        # bound attribute instead of materializing a resolved dict.
+        transfer_port = (port_overrides.get("transfer_port")
+                         or self._transfer_port)
+        self._validate_vial(vial)
+        if volume <= 0:
+            raise ValueError(f"Volume must be positive, got {volume}")
+        if speed is None:
+            speed = self._defaults["speed_normal"]
+
+        # The carousel load overlaps the speed setup and cycle planning;
+        # the wait lands right before liquid first reaches the needle.
+        load_done = self.load_to_replenishment_async(vial, verbose=verbose)
+        self.syringe.set_speed_uL_min(speed)
+        total_volume = volume + (flush_needle or 0)
+        cycle_volumes = self._split_volume_to_cycles(total_volume,
+                                                     self.syringe_size)
+        load_done()
+        # Precompute the per-cycle dispense amounts (only the last cycle
+        # can differ, when a needle flush is held back) so the loop body
+        # is a single branch-free sequence.
+        dispense_amounts = list(cycle_volumes)
+        if flush_needle:
+            dispense_amounts[-1] -= flush_needle
+        n = len(cycle_volumes)
+        # Hot loop: bind the devices to locals to avoid repeated
+        # attribute lookups per cycle.
+        valve = self.valve
+        syringe = self.syringe
+        batch = self._batch()
+        progress = self._progress.set
+        msg = self._MSG_CYCLE_ASP
+        for i, (asp_vol, disp_vol) in enumerate(zip(cycle_volumes,
+                                                    dispense_amounts)):
+            if verbose:
+                progress(msg(i + 1, n, asp_vol, solvent_port))
+            with batch:
+                valve.position(solvent_port)
+                syringe.aspirate(asp_vol)
+                valve.position(transfer_port)
+                syringe.dispense(disp_vol)
+
+        if flush_needle is not None:
+            # clean_needle's wash-vial load replaces the sample vial
+            # directly in the lift, so the explicit unload - a full
+            # carousel return trip - is skipped; clean_needle leaves the
+            # lift empty.
+            self.clean_needle(flush_needle, verbose=verbose)
+            unload_done = _noop_wait
+        else:
+            # The carousel's return trip overlaps the completion
+            # banner; the join keeps the call synchronous for callers.
+            unload_done = self.unload_from_replenishment_async(
+                verbose=verbose)
+        _status(f"Continuous fill of vial {vial} complete.")
+        unload_done()
+
+    def batch_fill(self, vial: int, volume: int, solvent_port: int,
+                   bubble_volume: int = 10,
+                   flush_needle: Optional[int] = None,
+                   speed: Optional[int] = None,
+                   verbose: Optional[bool] = None,
+                   **port_overrides) -> None:
+        """Fill a vial with an air-bubble-separated solvent plug.
+
+        A small air bubble is drawn first so the solvent plug does not mix
+        with the carrier in the transfer line.
+
+        Args:
+            vial: Carousel position of the destination vial (1-50).
+            volume: Volume to deliver in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            bubble_volume: Separating air bubble volume in microlitres.
+            flush_needle: Volume held back for a needle flush afterwards.
+            speed: Fill speed in microlitres per minute.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        air_port = port_overrides.get("air_port") or self._air_port
+        transfer_port = (port_overrides.get("transfer_port")
+                         or self._transfer_port)
+        self._validate_vial(vial)
+        if volume <= 0:
+            raise ValueError(f"Volume must be positive, got {volume}")
+        if speed is None:
+            speed = self._defaults["speed_normal"]
+
+        # The air-bubble draw needs no vial at the needle, so it runs
+        # while the carousel is still moving.
+        load_done = self.load_to_replenishment_async(vial, verbose=verbose)
+        self.syringe.set_speed_uL_min(self.config.speed_air)
+        self.valve.position(air_port)
+        self.syringe.aspirate(bubble_volume)
+        self.syringe.set_speed_uL_min(speed)
+
+        total_volume = volume + (flush_needle or 0)
+        max_per_cycle = self.syringe_size - bubble_volume
+        cycle_volumes = self._split_volume_to_cycles(total_volume,
+                                                     max_per_cycle)
+        load_done()
+        # Precompute the per-cycle dispense amounts: only the last cycle
+        # differs, pushing out the separating bubble minus any held-back
+        # needle flush, so the loop body is a single branch-free
+        # sequence.
+        dispense_amounts = list(cycle_volumes)
+        dispense_amounts[-1] += bubble_volume - (flush_needle or 0)
+        n = len(cycle_volumes)
+        # The split preserves volume and the stroke limit by
+        # construction; guard it cheaply in debug runs.
+        assert sum(cycle_volumes) == total_volume
+        # Hot loop: bind devices and ports to locals to avoid repeated
+        # attribute lookups per cycle.
+        valve = self.valve
+        syringe = self.syringe
+        batch = self._batch()
+        progress = self._progress.set
+        msg = self._MSG_CYCLE_ASP
+        if n == 1:
+            # The common small fill is one stroke; skip the loop
+            # scaffolding and run the single cycle directly.
+            if verbose:
+                progress(msg(1, 1, cycle_volumes[0], solvent_port))
+            with batch:
+                valve.position(solvent_port)
+                syringe.aspirate(cycle_volumes[0])
+                valve.position(transfer_port)
+                syringe.dispense(dispense_amounts[0])
+        else:
+            for i, (asp_vol, disp_vol) in enumerate(zip(cycle_volumes,
+                                                        dispense_amounts)):
+                if verbose:
+                    progress(msg(i + 1, n, asp_vol, solvent_port))
+                with batch:
+                    valve.position(solvent_port)
+                    syringe.aspirate(asp_vol)
+                    valve.position(transfer_port)
+                    syringe.dispense(disp_vol)
+
+        if flush_needle is not None:
+            # clean_needle's wash-vial load replaces the sample vial
+            # directly in the lift, so the explicit unload - a full
+            # carousel return trip - is skipped; clean_needle leaves the
+            # lift empty.
+            self.clean_needle(flush_needle, verbose=verbose)
+            unload_done = _noop_wait
+        else:
+            # The carousel's return trip overlaps the completion
+            # banner; the join keeps the call synchronous for callers.
+            unload_done = self.unload_from_replenishment_async(
+                verbose=verbose)
+        _status(f"Batch fill of vial {vial} complete.")
+        unload_done()
+
+    def continuous_fill_batch(self, vials: Sequence[int], volume: int,
+                              solvent_port: int,
+                              speed: Optional[int] = None,
+                              verbose: Optional[bool] = None,
+                              **port_overrides) -> None:
+        """Fill several vials, hiding carousel moves behind aspirations.
+
+        The per-vial loop is pipelined: as soon as a vial's last dispense
+        finishes, the next vial's load is posted (directly replacing the
+        current one in the lift) and the next first-cycle aspiration runs
+        while the carousel swaps. Compared to calling
+        :meth:`continuous_fill` in a loop, each vial after the first
+        hides most of one carousel move. No background thread is used -
+        the Chemstation exchange protocol posts the load and collects
+        the response later.
+
+        Args:
+            vials: Carousel positions of the destination vials, in order.
+            volume: Volume to deliver to each vial in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            speed: Fill speed in microlitres per minute.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        transfer_port = (port_overrides.get("transfer_port")
+                         or self._transfer_port)
+        for vial in vials:
+            self._validate_vial(vial)
+        if volume <= 0:
+            raise ValueError(f"Volume must be positive, got {volume}")
+        if not vials:
+            return
+        if speed is None:
+            speed = self._defaults["speed_normal"]
+
+        load_done = self.load_to_replenishment_async(vials[0],
+                                                     verbose=verbose)
+        self.syringe.set_speed_uL_min(speed)
+        cycle_volumes = list(self._split_volume_to_cycles(
+            volume, self.syringe_size))
+        first_cycle = cycle_volumes[0]
+        valve = self.valve
+        syringe = self.syringe
+        batch = self._batch()
+        n = len(vials)
+        for idx, vial in enumerate(vials):
+            _status(f"Vial {vial} ({idx + 1}/{n})...", end="")
+            # First-cycle aspiration overlaps the carousel seating the
+            # vial; the join lands right before the dispense needs it.
+            valve.position(solvent_port)
+            syringe.aspirate(first_cycle)
+            load_done()
+            # The first cycle's aspiration already ran above, so only
+            # its dispense remains; peeling it out of the loop keeps the
+            # per-cycle body free of the first-iteration branch.
+            with batch:
+                valve.position(transfer_port)
+                syringe.dispense(first_cycle)
+            for cycle_vol in itertools.islice(cycle_volumes, 1, None):
+                with batch:
+                    valve.position(solvent_port)
+                    syringe.aspirate(cycle_vol)
+                    valve.position(transfer_port)
+                    syringe.dispense(cycle_vol)
+            if idx + 1 < n:
+                # Post the swap to the next vial; the next iteration's
+                # aspiration runs during the carousel move.
+                load_done = self.load_to_replenishment_async(
+                    vials[idx + 1], verbose=verbose)
+        self.unload_from_replenishment(verbose=verbose)
+        _status(f"Batch of {n} vials filled.")
+
+    async def continuous_fill_async(self, vial: int, volume: int,
+                                    solvent_port: int, **kwargs) -> None:
+        """Asyncio wrapper around :meth:`continuous_fill`.
+
+        The blocking serial workflow runs in a worker thread, so the
+        event loop stays free for concurrent work - e.g. gathering fills
+        on two independent SIA lines, or interleaving CE control and
+        logging. Do not run two coroutines against the same devices at
+        once; the drivers serialize on their ports but the workflows
+        would interleave mid-sequence.
+
+        Args:
+            vial: Carousel position of the destination vial (1-50).
+            volume: Volume to deliver in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            **kwargs: Forwarded to :meth:`continuous_fill`.
+        """
+        await asyncio.to_thread(self.continuous_fill, vial, volume,
+                                solvent_port, **kwargs)
+
+    async def batch_fill_async(self, vial: int, volume: int,
+                               solvent_port: int, **kwargs) -> None:
+        """Asyncio wrapper around :meth:`batch_fill`.
+
+        See :meth:`continuous_fill_async` for the concurrency caveats.
+
+        Args:
+            vial: Carousel position of the destination vial (1-50).
+            volume: Volume to deliver in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            **kwargs: Forwarded to :meth:`batch_fill`.
+        """
+        await asyncio.to_thread(self.batch_fill, vial, volume,
+                                solvent_port, **kwargs)
+
+    def batch_fill_multiple_solvents(self, vial: int,
+                                     solvent_ports: Sequence,
+                                     volumes: Optional[List[int]] = None,
+                                     solvent_speeds: Optional[List[int]] = None,
+                                     air_push_volume: int = 15,
+                                     flush_needle: Optional[int] = None,
+                                     speed: Optional[int] = None,
+                                     verbose: Optional[bool] = None) -> None:
+        """Fill one vial with several solvents separated by air pushes.
+
+        Each solvent plug is preceded by a small air push so consecutive
+        solvents do not mix in the transfer line.
+
+        Args:
+            vial: Carousel position of the destination vial (1-50).
+            solvent_ports: Valve ports of the solvent reservoirs, in
+                order; alternatively a sequence of :class:`SolventStep`
+                with ``volumes`` omitted.
+            volumes: Volume of each solvent in microlitres.
+            solvent_speeds: Per-solvent fill speeds; defaults to ``speed``
+                for every solvent.
+            air_push_volume: Separating air push volume in microlitres.
+            flush_needle: Volume held back for a needle flush afterwards.
+            speed: Default fill speed in microlitres per minute.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        self._validate_vial(vial)
+        if speed is None:
+            speed = self._defaults["speed_normal"]
+        # Normalize the parallel lists (or pre-built steps) in a single
+        # validating pass that also tracks the largest plug.
+        steps = self._normalize_solvent_steps(solvent_ports, volumes,
+                                              solvent_speeds, speed,
+                                              air_push_volume)
+
+        # The total is only reported, never dispensed from, so the O(N)
+        # sum and the banner strings are built solely for verbose runs.
+        if verbose:
+            total_volume = sum(step.volume for step in steps)
+            _status(
+                f"Filling vial {vial} with {len(steps)} solvents "
+                f"({total_volume} µL total)...")
+        self.load_to_replenishment(vial, verbose=verbose)
+
+        # Hot loop: bind config values and devices to locals to avoid
+        # repeated attribute lookups per solvent.
+        cfg = self.config
+        air_speed = cfg.speed_air
+        air_port = cfg.air_port
+        transfer_port = cfg.transfer_port
+        syringe = self.syringe
+        valve = self.valve
+        n = len(steps)
+        progress = self._progress.set
+        batch = self._batch()
+        msg = self._MSG_SOLVENT
+        for idx, (port, volume, solvent_speed) in enumerate(steps):
+            if verbose:
+                progress(msg(idx + 1, n, volume, port))
+            # The speed rides chained inside the aspirate frame and is
+            # elided entirely when already active, so identical
+            # consecutive solvent speeds cost no extra command. The
+            # batch coalesces each rotation with its following stroke
+            # into one write per device; the rotations themselves stay
+            # synchronization points, since the selector must settle
+            # before liquid moves through it.
+            with batch:
+                valve.position(air_port)
+                syringe.aspirate(air_push_volume, speed=air_speed)
+                valve.position(port)
+                syringe.aspirate(volume, speed=solvent_speed)
+                valve.position(transfer_port)
+                syringe.dispense()
+
+        self.unload_from_replenishment(verbose=verbose)
+        if flush_needle is not None:
+            self.clean_needle(flush_needle, verbose=verbose)
+        if verbose:
+            _status(
+                f"Vial {vial} filled with {total_volume} µL total.")
+
+    def _normalize_solvent_steps(self, solvent_ports, volumes,
+                                 solvent_speeds, default_speed: int,
+                                 air_push_volume: int
+                                 ) -> Tuple[SolventStep, ...]:
+        """Normalize multi-solvent arguments into SolventStep records.
+
+        The validation and step build are memoized per argument
+        signature, so scripted campaigns repeating the same solvent
+        schedule skip both on every call after the first. Arguments that
+        do not hash (e.g. nested lists of step triples) take the
+        uncached path unchanged.
+
+        Raises:
+            ValueError: If the parallel lists disagree in length, a
+                volume is not positive, or the largest plug plus air
+                push exceeds the syringe.
+        """
+        try:
+            key_ports = (tuple(map(tuple, solvent_ports))
+                         if volumes is None else tuple(solvent_ports))
+            return self._normalized_steps(
+                key_ports,
+                None if volumes is None else tuple(volumes),
+                None if solvent_speeds is None else tuple(solvent_speeds),
+                default_speed, air_push_volume, self.syringe_size)
+        except TypeError:
+            return self._normalized_steps.__wrapped__(
+                solvent_ports, volumes, solvent_speeds, default_speed,
+                air_push_volume, self.syringe_size)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _normalized_steps(solvent_ports, volumes, solvent_speeds,
+                          default_speed: int, air_push_volume: int,
+                          syringe_size: int) -> Tuple[SolventStep, ...]:
+        """Validate and build the step records for a solvent schedule.
+
+        Validates lengths, positivity and the largest plug against the
+        syringe size in the same single pass that builds the steps.
+        """
+        if volumes is None:
+            steps = tuple(SolventStep(*step) for step in solvent_ports)
+        else:
+            if len(solvent_ports) != len(volumes):
+                raise ValueError(
+                    f"solvent_ports ({len(solvent_ports)}) and volumes "
+                    f"({len(volumes)}) must have the same length"
+                )
+            if solvent_speeds is None:
+                speeds = itertools.repeat(default_speed)
+            elif len(solvent_speeds) != len(volumes):
+                raise ValueError(
+                    f"solvent_speeds ({len(solvent_speeds)}) and volumes "
+                    f"({len(volumes)}) must have the same length"
+                )
+            else:
+                speeds = solvent_speeds
+            steps = tuple(SolventStep(port, volume, speed)
+                          for port, volume, speed
+                          in zip(solvent_ports, volumes, speeds))
+        max_volume = 0
+        for step in steps:
+            if step.volume <= 0:
+                raise ValueError(
+                    f"Volume must be positive, got {step.volume}")
+            if step.volume > max_volume:
+                max_volume = step.volume
+        if max_volume + air_push_volume > syringe_size:
+            raise ValueError(
+                f"Largest solvent volume plus air push "
+                f"({max_volume + air_push_volume} µL) exceeds syringe "
+                f"size {syringe_size} µL"
+            )
+        return steps
+
+    def plan_campaign(self, vials: Sequence[int], volume: int,
+                      solvent_port: int,
+                      flush_needle: Optional[int] = None,
+                      speed: Optional[int] = None,
+                      **port_overrides) -> "CampaignPlan":
+        """Resolve a same-volume multi-vial fill campaign up front.
+
+        Args:
+            vials: Carousel positions of the destination vials.
+            volume: Volume to deliver to each vial in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            flush_needle: Volume held back for a needle flush per vial.
+            speed: Fill speed in microlitres per minute.
+            **port_overrides: Optional ``<name>_port`` overrides.
+
+        Returns:
+            A :class:`~SIA_API.methods.planning.CampaignPlan` for
+            :meth:`run_campaign`.
+
+        Raises:
+            ValueError: If the volume is not positive or a vial number
+                is out of range.
+        """
+        from .planning import CampaignPlan
+
+        if volume <= 0:
+            raise ValueError(f"Volume must be positive, got {volume}")
+        for vial in vials:
+            self._validate_vial(vial)
+        ports = self._resolve_ports(**port_overrides)
+        cycle_volumes = self._split_volume_to_cycles(
+            volume + (flush_needle or 0), self.syringe_size)
+        dispense_amounts = list(cycle_volumes)
+        if flush_needle:
+            dispense_amounts[-1] -= flush_needle
+        return CampaignPlan(
+            vials=tuple(vials),
+            solvent_port=solvent_port,
+            transfer_port=ports["transfer_port"],
+            speed=(speed if speed is not None
+                   else self._defaults["speed_normal"]),
+            cycle_volumes=tuple(cycle_volumes),
+            dispense_amounts=tuple(dispense_amounts),
+            flush_needle=flush_needle,
+        )
+
+    def run_campaign(self, plan: "CampaignPlan",
+                     verbose: Optional[bool] = None) -> None:
+        """Execute a planned fill campaign vial by vial.
+
+        Args:
+            plan: Campaign plan from :meth:`plan_campaign`.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        n = len(plan.vials)
+        for i, vial in enumerate(plan.vials):
+            _status(f"Vial {vial} ({i + 1}/{n})...", end="")
+            self._execute_plan(plan, vial, verbose)
+        _status(f"Campaign of {n} vials complete.")
+
+    def run_compiled_campaign(self, compiled: "CompiledCampaign",
+                              verbose: Optional[bool] = None) -> None:
+        """Execute a campaign compiled into action/argument arrays.
+
+        Walks the structure-of-arrays schedule from
+        :func:`~SIA_API.methods.planning.compile_campaign` with a single
+        dispatch loop; the command frames themselves come from the
+        drivers' cached encoders, so each step is a lookup plus a write.
+
+        Args:
+            compiled: Compiled campaign schedule.
+            verbose: Override the configured verbosity.
+        """
+        from .planning import (ACTION_ASPIRATE, ACTION_DISPENSE,
+                               ACTION_LOAD, ACTION_SPEED, ACTION_VALVE)
+
+        verbose = self._get_verbose(verbose)
+        valve = self.valve
+        syringe = self.syringe
+        for action, arg in zip(compiled.actions, compiled.args):
+            if action == ACTION_VALVE:
+                valve.position(arg)
+            elif action == ACTION_ASPIRATE:
+                syringe.aspirate(arg)
+            elif action == ACTION_DISPENSE:
+                syringe.dispense(arg)
+            elif action == ACTION_LOAD:
+                self.load_to_replenishment(arg, verbose=verbose)
+            elif action == ACTION_SPEED:
+                syringe.set_speed_uL_min(arg)
+            else:
+                self.unload_from_replenishment(verbose=verbose)
+
+    def _execute_plan(self, plan: "CampaignPlan", vial: int,
+                      verbose: bool) -> None:
+        """Fill one vial from a precomputed campaign plan."""
+        load_done = self.load_to_replenishment_async(vial, verbose=verbose)
+        self.syringe.set_speed_uL_min(plan.speed)
+        load_done()
+        # Hot loop: bind the devices and the plan's ports to locals to
+        # avoid repeated attribute lookups per cycle.
+        valve = self.valve
+        syringe = self.syringe
+        solvent_port = plan.solvent_port
+        transfer_port = plan.transfer_port
+        batch = self._batch()
+        for asp, disp in zip(plan.cycle_volumes, plan.dispense_amounts):
+            with batch:
+                valve.position(solvent_port)
+                syringe.aspirate(asp)
+                valve.position(transfer_port)
+                syringe.dispense(disp)
+        self.unload_from_replenishment(verbose=verbose)
+        if plan.flush_needle is not None:
+            self.clean_needle(plan.flush_needle, verbose=verbose)
+
+    def _plan_carousel_order(self, vials: Sequence[int]) -> List[int]:
+        """Order vials to minimize total carousel rotation.
+
+        The carousel is a 50-position ring, so the shortest tour over a
+        set of vials walks the ring in one direction and skips the
+        largest angular gap between requested positions: total travel is
+        one circumference minus that gap, instead of the back-and-forth
+        jumps of an arbitrary visit order.
+
+        Args:
+            vials: Carousel positions to visit; duplicates are dropped.
+
+        Returns:
+            The vials reordered for minimal aggregate carousel travel.
+        """
+        ordered = sorted(dict.fromkeys(vials))
+        if len(ordered) <= 2:
+            return ordered
+        ring = self._VIAL_RANGE[-1]
+        gaps = [(ordered[(i + 1) % len(ordered)] - ordered[i]) % ring
+                for i in range(len(ordered))]
+        start = (gaps.index(max(gaps)) + 1) % len(ordered)
+        return ordered[start:] + ordered[:start]
+
+    def run_fill_campaign(self, vials: Sequence[int], volume: int,
+                          solvent_port: int, **kwargs) -> None:
+        """Fill several vials, visiting them in minimal-travel order.
+
+        Reorders the vials with :meth:`_plan_carousel_order` before
+        delegating each fill to :meth:`continuous_fill`; for a spread-out
+        plate this roughly halves the aggregate carousel travel compared
+        to filling in request order.
+
+        Args:
+            vials: Carousel positions of the destination vials.
+            volume: Volume to deliver to each vial in microlitres.
+            solvent_port: Valve port of the solvent reservoir.
+            **kwargs: Forwarded to :meth:`continuous_fill`.
+        """
+        for vial in self._plan_carousel_order(vials):
+            self.continuous_fill(vial, volume, solvent_port, **kwargs)
+
+    def execute_plate_fill(self, vials: List[int], volumes: List[int],
+                           verbose: Optional[bool] = None) -> None:
+        """Fill many vials from precomputed single-frame pump programs.
+
+        Plans the whole campaign up front with
+        :func:`~SIA_API.methods.planning.plan_plate_fill`, then sends one
+        chained command frame per vial. Requires the solvent to be plumbed
+        to the syringe input line.
+
+        Args:
+            vials: Carousel positions of the destination vials.
+            volumes: Volume to deliver to each vial in microlitres.
+            verbose: Override the configured verbosity.
+        """
+        from .planning import plan_plate_fill
+
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        plans = plan_plate_fill(vials, volumes, self.syringe)
+        bus = self.syringe._serial
+        wait_ready = self.syringe._wait_for_ready
+        for i, plan in enumerate(plans):
+            _status(f"Vial {plan.vial} ({i + 1}/{len(plans)}): "
+                    f"{sum(plan.cycle_volumes)} µL in "
+                    f"{len(plan.cycle_volumes)} cycles...", end="")
+            self.load_to_replenishment(plan.vial, verbose=verbose)
+            # One frame, one acknowledgement: reading the ack keeps the
+            # request/response stream aligned before the ready wait's
+            # status polls, and the exchange lock keeps another driver
+            # on a shared bus from interleaving between the two.
+            with bus.lock:
+                bus.write(plan.program)
+                bus.read_until(b"\r")
+            wait_ready()
+            # The raw program rotated the head valve (IP...OD...) behind
+            # the driver's back; re-sync the shadow so the next valve
+            # switch is not wrongly elided as redundant. Speed and net
+            # plunger volume are unchanged by a full fill cycle.
+            self.syringe._valve_state = "out"
+            self.unload_from_replenishment(verbose=verbose)
+        _status(f"Plate fill of {len(plans)} vials complete.")
+
+    # --- homogenization workflows -------------------------------------------
+
+    def homogenize_sample(self, vial: int, homogenization_time: float,
+                          speed: int = 2000,
+                          flush_needle: Optional[int] = None,
+                          verbose: Optional[bool] = None,
+                          **port_overrides) -> None:
+        """Mix a vial by bubbling air through it for a given time.
+
+        Args:
+            vial: Carousel position of the sample vial (1-50).
+            homogenization_time: Total mixing time in seconds.
+            speed: Air flow rate in microlitres per minute.
+            flush_needle: Volume held back for a needle flush afterwards.
+            verbose: Override the configured verbosity.
+            **port_overrides: Optional ``<name>_port`` overrides.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        ports = self._resolve_ports(**port_overrides)
+        self._validate_vial(vial)
+
+        # Integer ceiling of time*speed/60: float division here can land
+        # just below a whole microlitre and truncate a cycle away.
+        volume_air = (int(homogenization_time * speed) + 59) // 60
+        total_volume = volume_air + (flush_needle or 0)
+        cycle_volumes = self._split_volume_to_cycles(total_volume,
+                                                     self.syringe_size)
+
+        # Drawing air needs no vial at the needle, so the first cycle's
+        # aspiration runs while the carousel is still moving; the join
+        # lands right before the first dispense into the vial.
+        load_done = self.load_to_replenishment_async(vial, verbose=verbose)
+        self.syringe.set_speed_uL_min(speed)
+        # Hot loop: bind devices and ports to locals to avoid repeated
+        # attribute and dict lookups per cycle. The devices (not their
+        # bound methods) are bound, so the batch's buffered replacements
+        # still take effect inside the context.
+        valve = self.valve
+        syringe = self.syringe
+        air_port = ports["air_port"]
+        transfer_port = ports["transfer_port"]
+        # Only the last cycle differs, when a needle flush is held back;
+        # precomputing the dispense amounts keeps the loop branch-free.
+        dispense_amounts = list(cycle_volumes)
+        if flush_needle is not None:
+            dispense_amounts[-1] -= flush_needle
+        n = len(cycle_volumes)
+        valve.position(air_port)
+        syringe.aspirate(cycle_volumes[0])
+        load_done()
+        batch = self._batch()
+        progress = self._progress.set
+        msg = self._MSG_CYCLE_BUBBLE
+        if verbose:
+            progress(msg(1, n, cycle_volumes[0]))
+        # The first cycle's aspiration already overlapped the carousel
+        # move, so only its dispense remains; peeling it out of the loop
+        # keeps the per-cycle body free of the first-iteration branch.
+        with batch:
+            valve.position(transfer_port)
+            syringe.dispense(dispense_amounts[0])
+        rest = itertools.islice(zip(cycle_volumes, dispense_amounts), 1, None)
+        for i, (asp_vol, disp_vol) in enumerate(rest, 2):
+            if verbose:
+                progress(msg(i, n, asp_vol))
+            with batch:
+                valve.position(air_port)
+                syringe.aspirate(asp_vol)
+                valve.position(transfer_port)
+                syringe.dispense(disp_vol)
+
+        if flush_needle is not None:
+            # clean_needle's wash-vial load replaces the sample vial
+            # directly in the lift, so the explicit unload - a full
+            # carousel return trip - is skipped; clean_needle leaves the
+            # lift empty.
+            self.clean_needle(flush_needle, verbose=verbose)
+            unload_done = _noop_wait
+        else:
+            # The carousel's return trip overlaps the completion
+            # banner; the join keeps the call synchronous for callers.
+            unload_done = self.unload_from_replenishment_async(
+                verbose=verbose)
+        _status(f"Homogenization of vial {vial} complete.")
+        unload_done()
+
+    def prepare_for_liquid_homogenization(self,
+                                          solvent_port: Optional[int] = None,
+                                          transfer_line_volume: Optional[int] = None,
+                                          verbose: Optional[bool] = None) -> None:
+        """Fill the transfer line with carrier before liquid mixing.
+
+        Args:
+            solvent_port: Valve port of the carrier reservoir; defaults to
+                the DI-water port.
+            transfer_line_volume: Line volume in microlitres.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        cfg = self.config
+        solvent_port = solvent_port or self.ports.di_port
+        if transfer_line_volume is None:
+            transfer_line_volume = \
+                self._defaults["default_transfer_line_volume"]
+
+        _status("Priming transfer line for homogenization...")
+        self.syringe.set_speed_uL_min(cfg.speed_normal)
+        self.valve.position(solvent_port)
+        self.syringe.aspirate(transfer_line_volume)
+        self.valve.position(cfg.transfer_port)
+        self.syringe.dispense()
+        _status("Transfer line primed.")
+
+    def homogenize_by_liquid_mixing(self, vial: int, num_cycles: int = 5,
+                                    volume_aspirate: Optional[int] = None,
+                                    aspirate_speed: Optional[int] = None,
+                                    dispense_speed: Optional[int] = None,
+                                    wait_after_aspirate: Optional[float] = None,
+                                    wait_after_dispense: Optional[float] = None,
+                                    verbose: Optional[bool] = None) -> None:
+        """Mix a vial by repeatedly drawing and returning sample liquid.
+
+        Args:
+            vial: Carousel position of the sample vial (1-50).
+            num_cycles: Number of aspirate/dispense mixing cycles.
+            volume_aspirate: Volume moved per cycle in microlitres.
+            aspirate_speed: Draw speed in microlitres per minute.
+            dispense_speed: Return speed in microlitres per minute.
+            wait_after_aspirate: Settling wait after each draw (seconds).
+            wait_after_dispense: Settling wait after each return (seconds).
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        self._validate_vial(vial)
+        defaults = self._defaults
+        if volume_aspirate is None:
+            volume_aspirate = defaults["default_homogenization_volume"]
+        if aspirate_speed is None:
+            aspirate_speed = defaults["mixing_aspirate_speed"]
+        if dispense_speed is None:
+            dispense_speed = defaults["mixing_dispense_speed"]
+        wait_after_aspirate = wait_after_aspirate or 0.0
+        wait_after_dispense = wait_after_dispense or 0.0
+
+        self.load_to_replenishment(vial, verbose=verbose)
+        self.valve.position(self.config.transfer_port)
+
+        if (wait_after_aspirate == 0 and wait_after_dispense == 0) \
+                or not verbose:
+            # Run the whole loop inside the pump firmware: the delay
+            # opcode covers the settle waits, so this is one round trip
+            # instead of two per cycle. Only kept on the host when
+            # verbose runs want live per-cycle progress.
+            if verbose:
+                self._progress.set(
+                    f"Mixing {num_cycles} cycles of {volume_aspirate} µL "
+                    f"in pump firmware...")
+            self.syringe.program_cycle(
+                volume_aspirate, num_cycles, aspirate_speed, dispense_speed,
+                delay_after_aspirate=wait_after_aspirate,
+                delay_after_dispense=wait_after_dispense)
+            self.unload_from_replenishment(verbose=verbose)
+            _status(
+                f"Liquid mixing of vial {vial} complete.")
+            return
+
+        # Hot loop: bind the syringe to a local to avoid repeated
+        # attribute lookups per cycle. Each stroke chains its speed
+        # change into the motion frame, so a cycle costs two serial
+        # round trips instead of four.
+        syringe = self.syringe
+        monotonic = time.monotonic
+        _sleep = _precise_sleep
+        progress = self._progress.set
+        # All progress lines are known up front; formatting them here
+        # keeps string building out of the settle-wait timing below.
+        msg_asp = self._MSG_MIX_ASP
+        msg_disp = self._MSG_MIX_DISP
+        messages = [
+            (msg_asp(c, num_cycles, volume_aspirate, aspirate_speed),
+             msg_disp(c, num_cycles, volume_aspirate, dispense_speed))
+            for c in range(1, num_cycles + 1)
+        ]
+        for asp_line, disp_line in messages:
+            if verbose:
+                progress(asp_line)
+            syringe.aspirate(volume_aspirate, speed=aspirate_speed)
+            deadline = monotonic() + wait_after_aspirate
+            if verbose:
+                progress(disp_line)
+            _sleep(deadline - monotonic())
+            syringe.dispense(volume_aspirate, speed=dispense_speed)
+            _sleep(wait_after_dispense)
+
+        self.unload_from_replenishment(verbose=verbose)
+        _status(f"Liquid mixing of vial {vial} complete.")
+
+    def homogenize_by_air_mixing(self, vial: int, num_cycles: int = 5,
+                                 volume_air: Optional[int] = None,
+                                 verbose: Optional[bool] = None) -> None:
+        """Mix a vial by injecting discrete air bubbles.
+
+        Args:
+            vial: Carousel position of the sample vial (1-50).
+            num_cycles: Number of air-bubble injection cycles.
+            volume_air: Air volume per cycle in microlitres.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        self._validate_vial(vial)
+        if volume_air is None:
+            volume_air = self._defaults["default_air_flush"]
+
+        self.load_to_replenishment(vial, verbose=verbose)
+        # Hot loop: bind config values and devices to locals to avoid
+        # repeated attribute lookups per cycle.
+        cfg = self.config
+        speed_air = cfg.speed_air
+        air_port = cfg.air_port
+        transfer_port = cfg.transfer_port
+        syringe = self.syringe
+        valve = self.valve
+        progress = self._progress.set
+        msg = self._MSG_AIR_INJECT
+        messages = [msg(c, num_cycles, volume_air)
+                    for c in range(1, num_cycles + 1)]
+        for line in messages:
+            if verbose:
+                progress(line)
+            syringe.set_speed_uL_min(speed_air)
+            valve.position(air_port)
+            syringe.aspirate(volume_air)
+            valve.position(transfer_port)
+            syringe.dispense(volume_air)
+
+        self.unload_from_replenishment(verbose=verbose)
+        _status(f"Air mixing of vial {vial} complete.")
+
+    # --- cleaning workflows -------------------------------------------------
+
+    def clean_needle(self, volume_flush: float,
+                     wash_vial: Optional[int] = None,
+                     verbose: Optional[bool] = None) -> None:
+        """Flush the needle tip into the wash vial.
+
+        Args:
+            volume_flush: Volume reserved in the syringe for the flush.
+            wash_vial: Carousel position of the wash vial.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        if wash_vial is None:
+            wash_vial = self._defaults["wash_vial"]
+
+        _status(self._MSG_NEEDLE_FLUSH(volume_flush), end="")
+        # The settle window overlaps the carousel load: only whatever
+        # the load did not absorb is actually slept.
+        self._schedule_delay(2.0)
+        self.load_to_replenishment(wash_vial, verbose=verbose)
+        self._await_deadline()
+        half = volume_flush / 2
+        syringe = self.syringe
+        first_half = (syringe._expected_motion_time(half)
+                      if hasattr(syringe, "_expected_motion_time") else None)
+        if first_half is not None and hasattr(syringe, "run_program"):
+            # Both half-dispenses and the needle-clearing delay run as a
+            # single firmware program - one serial round trip instead of
+            # two, with the 0.3 s gap in the pump. The host sleeps out
+            # only the first half's duration before posting the vial's
+            # return trip, so the second half still overlaps the
+            # carousel motion. The unload itself stays a Chemstation
+            # exchange; it cannot ride inside the pump program.
+            syringe.run_program((("dispense", half), ("delay", 0.3),
+                                 ("dispense", half)), wait=False)
+            _precise_sleep(first_half + 0.1)
+            unload_done = self.unload_from_replenishment_async(
+                verbose=verbose)
+            syringe.wait_for_ready()
+        else:
+            syringe.dispense(half)
+            # Start the vial's return trip, wait just long enough for
+            # the needle to clear, and push the second half while the
+            # carousel is still rotating home.
+            unload_done = self.unload_from_replenishment_async(
+                verbose=verbose)
+            _precise_sleep(0.3)
+            syringe.dispense(half)
+        unload_done()
+        _status(self._MSG_NEEDLE_DONE)
+
+    def clean_transfer_line_after_homogenization(
+            self, cleaning_solution_vial: Optional[int] = None,
+            waste_vial: Optional[int] = None,
+            cleaning_solution_volume: Optional[int] = None,
+            verbose: Optional[bool] = None) -> None:
+        """Clean the transfer line after sample contact during mixing.
+
+        Draws cleaning solution into the line, lets it react, flushes it
+        to waste and finally parks a protective air bubble in the needle.
+
+        Args:
+            cleaning_solution_vial: Vial holding the cleaning solution.
+            waste_vial: Vial collecting the flushed waste.
+            cleaning_solution_volume: Cleaning solution volume in
+                microlitres.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        cfg = self.config
+        defaults = self._defaults
+        if cleaning_solution_vial is None:
+            cleaning_solution_vial = defaults["cleaning_solution_vial"]
+        if waste_vial is None:
+            waste_vial = defaults["waste_vial"]
+        if cleaning_solution_volume is None:
+            cleaning_solution_volume = defaults["cleaning_solution_volume"]
+        # Fail early if either vial is missing; cached, so repeat runs
+        # with the same vials cost no Chemstation round trip.
+        self._validate_vial_present(cleaning_solution_vial)
+        self._validate_vial_present(waste_vial)
+
+        _status(self._MSG_CLEAN_WITH(cleaning_solution_volume))
+
+        def _at_vial(vial: int) -> None:
+            if vial == cleaning_solution_vial:
+                with self._batch():
+                    self.syringe.set_speed_uL_min(cfg.speed_cleaning)
+                    self.valve.position(cfg.transfer_port)
+                    self.syringe.aspirate(cleaning_solution_volume)
+                time.sleep(cfg.wait_cleaning_reaction)
+            else:
+                self.syringe.dispense()
+                self.valve.position(cfg.waste_port)
+
+        # One itinerary instead of load/unload/load/unload: the waste
+        # vial replaces the cleaning vial directly in the lift.
+        self.visit_replenishment((cleaning_solution_vial, waste_vial),
+                                 _at_vial, verbose=verbose)
+
+        # Park an air bubble in the needle to keep the line clean.
+        _status(self._MSG_CLEAN_BUBBLE, end="")
+        self.valve.position(cfg.air_port)
+        self.syringe.aspirate(cfg.air_push_volume)
+        self.syringe.push_through_valve_in()
+        _status(self._MSG_CLEAN_DONE)
+
+    def flush_transfer_line_to_waste(self,
+                                     transfer_line_volume: Optional[int] = None,
+                                     air_push: Optional[int] = None,
+                                     verbose: Optional[bool] = None) -> None:
+        """Push the transfer line content to the waste port.
+
+        Args:
+            transfer_line_volume: Line volume in microlitres.
+            air_push: Air volume used to drive the liquid out.
+            verbose: Override the configured verbosity.
+        """
+        verbose = self._get_verbose(verbose)
+        _status = self._status_printer(verbose)
+        cfg = self.config
+        defaults = self._defaults
+        if transfer_line_volume is None:
+            transfer_line_volume = defaults["default_transfer_line_volume"]
+        if air_push is None:
+            air_push = defaults["air_push_volume"]
+        half_push = air_push // 2
+
+        _status(self._MSG_FLUSH_WASTE)
+        # Make sure no vial is loaded before moving liquid through the line.
+        self.unload_from_replenishment(verbose=verbose)
+        with self._batch():
+            self.syringe.set_speed_uL_min(cfg.speed_cleaning)
+            self.valve.position(cfg.air_port)
+            self.syringe.aspirate(air_push)
+            self.syringe.push_through_valve_in(half_push)
+            self.valve.position(cfg.transfer_port)
+            self.syringe.aspirate(transfer_line_volume)
+            self.valve.position(cfg.waste_port)
+            self.syringe.dispense()
+        _status(self._MSG_FLUSH_DONE)
+
+    # --- configuration ------------------------------------------------------
+
+    def _refresh_defaults(self) -> None:
+        """Rebuild the lookup of resolved keyword-argument defaults.
+
+        Workflows fall back to this dict with an explicit ``is not
+        None`` test instead of ``param or self.config.attr``: one dict
+        load replaces two attribute loads per default, and a
+        caller-supplied ``0`` reaches validation instead of being
+        silently swapped for the configured value by ``or``.
+        Rebuilt by :meth:`update_config` whenever the config changes.
+        """
+        cfg = self.config
+        self._defaults = {
+            "waste_vial": cfg.waste_vial,
+            "wash_vial": cfg.wash_vial,
+            "cleaning_solution_vial": cfg.cleaning_solution_vial,
+            "cleaning_solution_volume": cfg.cleaning_solution_volume,
+            "default_transfer_line_volume": cfg.default_transfer_line_volume,
+            "default_air_flush": cfg.default_air_flush,
+            "default_homogenization_volume":
+                cfg.default_homogenization_volume,
+            "speed_normal": cfg.speed_normal,
+            "mixing_aspirate_speed": cfg.mixing_aspirate_speed,
+            "mixing_dispense_speed": cfg.mixing_dispense_speed,
+            "air_push_volume": cfg.air_push_volume,
+        }
+
+    def update_config(self, **kwargs) -> None:
+        """Update workflow configuration values by keyword.
+
+        Args:
+            **kwargs: Attribute/value pairs matching
+                :class:`~SIA_API.methods.config.SIAConfig` fields.
+
+        Raises:
+            ValueError: If an unknown configuration key is passed.
+        """
+        config_keys = self._config_keys
+        for key, value in kwargs.items():
+            if key not in config_keys:
+                raise ValueError(f"Unknown configuration key: {key}")
+            setattr(self.config, key, value)
+        if "verbose" in kwargs:
+            self._print_status = self._status_printer(self.config.verbose)
+        self._refresh_defaults()
+        self._status_dirty = True
+
+    def get_system_status(self) -> Mapping:
+        """Report the current workflow configuration and device setup.
+
+        The report only changes when :meth:`update_config` runs, so it is
+        built once and the cached view is returned until the next config
+        change; monitoring loops can poll it without per-call allocations.
+
+        Returns:
+            Read-only nested mapping describing ports, devices and
+            configuration.
+        """
+        if self._status_dirty:
+            self._status_cache = MappingProxyType({
+                "ports": MappingProxyType({
+                    "air_port": self.ports.air_port,
+                    "meoh_port": self.ports.meoh_port,
+                    "di_port": self.ports.di_port,
+                    "transfer_port": self.ports.transfer_port,
+                    "waste_port": self.ports.waste_port,
+                }),
+                "devices": MappingProxyType({
+                    "syringe_size": self.syringe_size,
+                    "valve_positions": self.valve.num_positions,
+                }),
+                "config": MappingProxyType(dict(self.config.__dict__)),
+            })
+            self._status_dirty = False
+        return self._status_cache
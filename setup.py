@@ -0,0 +1,17 @@
+from setuptools import setup, find_packages
+
+setup(
+    name="sia-ce-code",
+    version="0.1.0",
+    description=(
+        "Automated capillary electrophoresis analysis with Agilent "
+        "Chemstation integration and SIA sample preparation."
+    ),
+    author="Xixaus",
+    license="MIT",
+    packages=find_packages(exclude=("tests",)),
+    python_requires=">=3.9",
+    install_requires=[
+        "pyserial>=3.4",
+    ],
+)
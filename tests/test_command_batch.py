@@ -0,0 +1,118 @@
+"""Wire-order regression tests for :class:`CommandBatch`.
+
+Runs against a fake serial module, so no hardware or pyserial install
+is needed: every write is recorded and every read acknowledges, which
+lets the tests assert the exact byte order that would reach the bus.
+"""
+
+import itertools
+import sys
+import types
+import unittest
+
+
+class _FakeSerial:
+    """Stand-in for serial.Serial recording everything written."""
+
+    def __init__(self, port=None, **kwargs):
+        self.port = port
+        self.written = b""
+
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+    def read_until(self, terminator=b"\r"):
+        return b"\r"
+
+    def set_low_latency_mode(self, enable):
+        pass
+
+    def close(self):
+        pass
+
+
+# Installed before the drivers import serial; also shadows a real
+# pyserial so the tests never touch an actual port.
+sys.modules["serial"] = types.SimpleNamespace(Serial=_FakeSerial)
+
+from SIA_API.core.command_batch import CommandBatch  # noqa: E402
+from SIA_API.core.syringe_controller import SyringeController  # noqa: E402
+from SIA_API.core.valve_selector import ValveSelector  # noqa: E402
+
+# Unique fake port name per test: the shared-bus registry keeps one
+# handle per port, and reusing a name would leak state between tests.
+_port_names = (f"FAKE{n}" for n in itertools.count())
+
+
+class CommandBatchWireOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        port = next(_port_names)
+        self.syringe = SyringeController(port, syringe_size=1000)
+        self.valve = ValveSelector(port)
+        self.wire = self.syringe._serial._serial
+
+    def _trace(self):
+        return self.wire.written.decode("ascii")
+
+    def assertWireOrder(self, *snippets):
+        trace = self._trace()
+        positions = [trace.index(s) for s in snippets]
+        self.assertEqual(positions, sorted(positions),
+                         f"wire order {snippets} violated in {trace!r}")
+
+    def test_chained_speed_motion_flushes_queued_valve_moves(self):
+        # aspirate(speed=...) emits a chained V...P... frame; it must
+        # still count as motion, or the valve rotation buffered for the
+        # dispense would jump ahead of the aspiration on the wire.
+        with CommandBatch(self.syringe, self.valve):
+            self.valve.position(6)
+            self.syringe.aspirate(5, speed=60000)
+            self.valve.position(4)
+            self.syringe.dispense(speed=60000)
+        self.assertWireOrder("GO6", "P15", "GO4", "D15")
+
+    def test_head_valve_dispense_counts_as_motion(self):
+        # push_through_valve_in's ID...O frame opens with a setter byte
+        # but moves the plunger; the rotation queued before it must be
+        # written first.
+        self.syringe._current_speed = 60000
+        with CommandBatch(self.syringe, self.valve):
+            self.valve.position(2)
+            self.syringe.aspirate(5)
+            self.valve.position(4)
+            self.syringe.push_through_valve_in(5)
+        self.assertWireOrder("GO2", "P15", "GO4", "ID15O")
+
+    def test_nested_batch_reuses_the_active_one(self):
+        # A batch opened while another is active must not swap out the
+        # outer sender: its flush would write ahead of frames still
+        # queued in the outer buffers.
+        self.syringe._current_speed = 60000
+        with CommandBatch(self.syringe, self.valve):
+            self.syringe.set_speed_uL_min(30000)
+            with CommandBatch(self.syringe, self.valve):
+                self.valve.position(2)
+                self.syringe.aspirate(5)
+            # The inner exit must neither flush nor unpatch; the outer
+            # buffered speed frame still precedes the stroke it governs.
+            self.assertWireOrder("V1500", "P15")
+            self.valve.position(4)
+            self.syringe.dispense()
+        self.assertWireOrder("V1500", "P15", "GO4", "D15")
+        # The outer exit unpatched the pump and cleared the marker.
+        self.assertIsNone(self.syringe._active_batch)
+
+    def test_pure_setters_accumulate_until_motion(self):
+        self.syringe._current_speed = 60000
+        with CommandBatch(self.syringe, self.valve):
+            self.syringe.valve_in()
+            self.syringe.valve_out()
+            self.assertEqual(self._trace(), "")
+            self.syringe.aspirate(5)
+        self.assertWireOrder("I", "O", "P15")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Wire-level tests for the compiled plate-fill path.
+
+The compiled programs bypass the driver's _send helpers with raw bus
+writes, so these tests assert the exchange discipline directly: one
+acknowledgement read per program frame, before any status poll.
+"""
+
+import sys
+import types
+import unittest
+
+
+class _FakeSerial:
+    """Stand-in for serial.Serial logging every write and read."""
+
+    def __init__(self, port=None, **kwargs):
+        self.port = port
+        self.ops = []
+
+    def write(self, data):
+        self.ops.append(("w", bytes(data)))
+        return len(data)
+
+    def read_until(self, terminator=b"\r"):
+        self.ops.append(("r",))
+        return b"\r"
+
+    def set_low_latency_mode(self, enable):
+        pass
+
+    def close(self):
+        pass
+
+
+# Installed before the drivers import serial (a stub left behind by
+# another test module works too; the bus handle is swapped per test).
+sys.modules.setdefault("serial", types.SimpleNamespace(Serial=_FakeSerial))
+
+from SIA_API.core.syringe_controller import SyringeController  # noqa: E402
+from SIA_API.core.valve_selector import ValveSelector  # noqa: E402
+from SIA_API.methods.prepared_methods import PreparedSIAMethods  # noqa: E402
+
+
+def _fake_chemstation():
+    """Chemstation stub accepting the carousel and validation calls."""
+    noop = lambda *args, **kwargs: None  # noqa: E731
+    return types.SimpleNamespace(
+        ce=types.SimpleNamespace(load_vial_to_position=noop,
+                                 unload_vial_from_position=noop),
+        validation=types.SimpleNamespace(validate_vials_in_system=noop,
+                                         validate_vial_in_system=noop),
+    )
+
+
+class ExecutePlateFillWireTest(unittest.TestCase):
+
+    def setUp(self):
+        self.syringe = SyringeController("FAKE-PLATE", syringe_size=1000)
+        self.valve = ValveSelector("FAKE-PLATE")
+        # Swap in a fresh logging handle so earlier tests on the shared
+        # registry cannot leak traffic into this one.
+        self.wire = _FakeSerial("FAKE-PLATE")
+        self.syringe._serial._serial = self.wire
+        self.methods = PreparedSIAMethods(_fake_chemstation(), self.syringe,
+                                          self.valve)
+
+    def test_program_ack_is_read_before_status_polls(self):
+        self.methods.execute_plate_fill([5, 6], [100, 100], verbose=False)
+        program = f"/{self.syringe.address}IP300OD300R\r".encode("ascii")
+        ops = self.wire.ops
+        writes = [i for i, op in enumerate(ops) if op == ("w", program)]
+        self.assertEqual(len(writes), 2)
+        for i in writes:
+            # The program's own ack must be consumed right after the
+            # write; otherwise the first Q poll of the ready wait reads
+            # the stale ack and the stream goes off-by-one per vial.
+            self.assertEqual(ops[i + 1], ("r",))
+            self.assertEqual(ops[i + 2][0], "w")
+            self.assertIn(b"Q", ops[i + 2][1])
+
+
+if __name__ == "__main__":
+    unittest.main()